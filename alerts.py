@@ -0,0 +1,168 @@
+# alerts.py
+"""
+Matching stored jobs against users' subscriptions.
+
+A subscription matches a job when every word of each field it sets (role,
+company, location) appears in that field of the job, after the same
+normalization dedupe uses ("Google India Pvt Ltd" ~ "google", "Bengaluru" ~
+"bangalore").
+
+Subscriptions asking for the same terms are folded into one pattern, and each
+pattern is kept in an inverted index under a single anchor term, the one
+shared with the fewest other patterns. A job only looks up the postings for
+its own terms and fully checks the few candidates found, so a batch costs
+about (jobs x candidates) instead of (jobs x subscriptions).
+
+New jobs are found through a watermark on jobs.id (upserts keep a posting's
+id and AUTOINCREMENT never hands out a deleted one again, so only genuinely
+new postings pass it) and notified once per (user, job).
+Copies dedupe.dedupe_stored_jobs() has grouped under an earlier posting
+(canonical_id set) are passed over: their group was matched already.
+"""
+from collections import Counter
+from functools import lru_cache
+import re, threading
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from models import db, Job, Subscription, Notification, AlertProgress
+from dedupe import norm_company, norm_location, norm_role
+
+FIELDS = ("role", "company", "location")
+NOTIFY_CHUNK = 1000
+MATCH_BATCH = 5000      # jobs read per query while matching
+
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+# ----------------- TERMS -----------------
+@lru_cache(maxsize=65536)
+def field_terms(field, value):
+    if not value:
+        return frozenset()
+    if field == "role":
+        return frozenset(norm_role(value).split())
+    if field == "company":
+        return frozenset(norm_company(value).split())
+    # "Bengaluru, Karnataka / Remote" -> every part, with city aliases folded
+    return frozenset(w for part in re.split(r"[,/|]", value) for w in norm_location(part).split())
+
+
+# ----------------- INDEX -----------------
+class SubscriptionIndex:
+    def __init__(self, subscriptions):
+        """
+        `subscriptions` yields (user_id, role, company, location).
+        Subscriptions with no terms at all are ignored.
+        """
+        users = {}           # pattern -> user ids, where a pattern is ((field, terms), ...)
+        for user_id, *values in subscriptions:
+            pattern = tuple((field, field_terms(field, value)) for field, value in zip(FIELDS, values)
+                            if field_terms(field, value))
+            if pattern:
+                users.setdefault(pattern, set()).add(user_id)
+        self.patterns = list(users.items())
+        self.size = sum(len(u) for u in users.values())
+
+        df = Counter((field, term) for pattern in users for field, terms in pattern for term in terms)
+        self.postings = {}   # (field, term) -> [pattern index]
+        for i, pattern in enumerate(users):
+            anchor = min(((field, term) for field, terms in pattern for term in terms), key=df.__getitem__)
+            self.postings.setdefault(anchor, []).append(i)
+
+    def __len__(self):
+        return self.size
+
+    def match(self, job):
+        """
+        User ids with at least one subscription matching `job`.
+        """
+        terms = {field: field_terms(field, job.get(field)) for field in FIELDS}
+        users = set()
+        for field, job_terms in terms.items():
+            for term in job_terms:
+                for i in self.postings.get((field, term), ()):
+                    pattern, subscribers = self.patterns[i]
+                    if all(wanted <= terms[f] for f, wanted in pattern):
+                        users |= subscribers
+        return users
+
+    @classmethod
+    def from_db(cls):
+        rows = db.session.execute(select(Subscription.user_id, Subscription.role,
+                                         Subscription.company, Subscription.location))
+        return cls(rows)
+
+
+def load_index():
+    """
+    Per-process SubscriptionIndex, rebuilt when subscriptions are added,
+    removed or edited (updated_at moves forward).
+    """
+    version = tuple(db.session.execute(select(func.count(Subscription.id), func.max(Subscription.id),
+                                              func.max(Subscription.updated_at))).one())
+    with _index_lock:
+        if _index_cache.get("version") != version:
+            _index_cache["index"] = SubscriptionIndex.from_db()
+            _index_cache["version"] = version
+        return _index_cache["index"]
+
+
+# ----------------- NOTIFICATIONS -----------------
+def notification_message(job):
+    message = f"New job: {job.get('role') or 'Untitled role'} at {job.get('company') or 'unknown company'}"
+    if job.get("location"):
+        message += f" ({job['location']})"
+    return message[:500]
+
+
+def write_notifications(rows):
+    """
+    Insert notification rows in bulk, skipping (user, job) pairs already
+    notified. Returns the number of rows inserted.
+    """
+    stmt = insert(Notification.__table__).on_conflict_do_nothing(index_elements=["user_id", "job_id"])
+    inserted = 0
+    for start in range(0, len(rows), NOTIFY_CHUNK):
+        inserted += db.session.execute(stmt, rows[start:start + NOTIFY_CHUNK]).rowcount
+    return inserted
+
+
+def match_new_jobs(index=None):
+    """
+    Notify subscribers about jobs stored since the last run, in one pass over
+    the new rows. Returns the number of notifications written. Needs an app context.
+    """
+    progress = AlertProgress.query.first()
+    if progress is None:
+        # First run: start from what is stored now rather than alerting on the whole backlog
+        last = db.session.execute(select(func.max(Job.id))).scalar() or 0
+        db.session.add(AlertProgress(last_job_id=last))
+        db.session.commit()
+        return 0
+    index = index if index is not None else load_index()
+
+    sent = 0
+    while True:
+        rows = db.session.execute(
+            select(Job.id, Job.role, Job.company, Job.location, Job.canonical_id)
+            .where(Job.id > progress.last_job_id).order_by(Job.id).limit(MATCH_BATCH)).all()
+        if not rows:
+            break
+        notes = []
+        if len(index):
+            for job_id, role, company, location, canonical_id in rows:
+                if canonical_id is not None:
+                    continue
+                job = {"role": role, "company": company, "location": location}
+                users = index.match(job)
+                if users:
+                    message = notification_message(job)
+                    notes.extend({"user_id": u, "job_id": job_id, "message": message} for u in users)
+        sent += write_notifications(notes)
+        progress.last_job_id = rows[-1].id
+        db.session.commit()
+    db.session.commit()
+    return sent
@@ -1,19 +1,34 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, render_template, request, redirect, url_for, session, flash, g
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 import csv
-from models import db, User
-
-# Executors
-from executors.naukri_executor import search_naukri_jobs
-from executors.unstop_executor import search_unstop_jobs
-from executors.linkedin_executor import search_linkedin_jobs
+from models import db, User, SearchHistory, upgrade_schema
+from search_cache import SearchCache, query_key, CACHE_TTL
+from search_tasks import TaskQueue
+from suggest import SuggestIndex
+from ranking import rank_jobs
+from dedupe import dedupe_jobs, dedupe_stored_jobs
+from storage import configure_engine
+from alerts import match_new_jobs
+from job_search import ensure_index, rebuild_index, search_jobs, stored_matches
+from executors.registry import SEARCH_DEADLINE, SOURCE_BUDGETS  # names only: no executor is imported here
+from executors.metrics import ENABLED as METRICS_ENABLED, exposition, observe_route
+import os, time
 
 app = Flask(__name__)
 app.secret_key = "supersecretkey"
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///database.db"
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///database.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["SEARCH_DEADLINE"] = SEARCH_DEADLINE  # seconds; /search never waits longer than this
+app.config["SOURCE_BUDGETS"] = dict(SOURCE_BUDGETS)
+app.config["CACHE_TTL"] = int(os.environ.get("CACHE_TTL", CACHE_TTL))  # seconds before cached results are refreshed
+app.config["STORED_RESULTS"] = int(os.environ.get("STORED_RESULTS", 50))  # stored jobs mixed into live results
+app.config["STORED_MAX_AGE_DAYS"] = int(os.environ.get("STORED_MAX_AGE_DAYS", 14))
+app.config["ADMIN_TOKEN"] = os.environ.get("ADMIN_TOKEN")  # enables /admin routes when set
 db.init_app(app)
+configure_engine(app)
+search_cache = SearchCache(app, ttl=app.config["CACHE_TTL"])
+search_tasks = TaskQueue()  # scraping itself happens in worker.py
 
 # ------------------- HELPERS -------------------
 _cached_csv = {}
@@ -25,6 +40,53 @@ def load_csv(file_path):
         _cached_csv[file_path] = data
         return data
 
+# Autocomplete indexes, built once per process
+suggest_indexes = {
+    "role": SuggestIndex(load_csv("data/roles.csv")),
+    "company": SuggestIndex(load_csv("data/companies.csv")),
+    "location": SuggestIndex(load_csv("data/locations.csv")),
+}
+
+def ranked_results(task):
+    # Matching jobs already in the jobs table show up immediately; live copies
+    # of the same postings are merged into them by dedupe_jobs
+    stored = []
+    if app.config["STORED_RESULTS"]:
+        stored = stored_matches(task["role"], task["company"], task["location"],
+                                max_age_days=app.config["STORED_MAX_AGE_DAYS"],
+                                limit=app.config["STORED_RESULTS"])
+    jobs = dedupe_jobs(task["jobs"] + stored)
+    return rank_jobs(jobs, task["role"], task["company"], task["location"])
+
+def owned_task(task_id):
+    task = search_tasks.snapshot(task_id)
+    if task is None or task["user_id"] != session.get("user_id"):
+        return None
+    return task
+
+# ------------------- METRICS -------------------
+if METRICS_ENABLED:
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_timing(response):
+        if request.endpoint and "request_start" in g:
+            observe_route(request.endpoint, time.perf_counter() - g.request_start)
+        return response
+
+@app.route("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint: stage timings, card counts, cache results, route timings.
+    """
+    exported = exposition()
+    if exported is None:
+        return "metrics disabled\n", 404, {"Content-Type": "text/plain"}
+    body, content_type = exported
+    return body, 200, {"Content-Type": content_type}
+
 # ------------------- ROUTES -------------------
 @app.route("/")
 def home():
@@ -79,9 +141,9 @@ def dashboard():
         flash("Please login first")
         return redirect(url_for("login"))
 
-    roles = load_csv("data/roles.csv")
-    companies = load_csv("data/companies.csv")
-    locations = load_csv("data/locations.csv")
+    roles = suggest_indexes["role"].items
+    companies = suggest_indexes["company"].items
+    locations = suggest_indexes["location"].items
 
     search_role = request.form.get("role", "").strip() if request.method=="POST" else ""
     search_company = request.form.get("company", "").strip() if request.method=="POST" else ""
@@ -89,11 +151,11 @@ def dashboard():
 
     # Filter top 5 dynamically
     if search_role:
-        roles = [r for r in roles if search_role.lower() in r.lower()][:5]
+        roles = suggest_indexes["role"].suggest(search_role, 5)
     if search_company:
-        companies = [c for c in companies if search_company.lower() in c.lower()][:5]
+        companies = suggest_indexes["company"].suggest(search_company, 5)
     if search_location:
-        locations = [l for l in locations if search_location.lower() in l.lower()][:5]
+        locations = suggest_indexes["location"].suggest(search_location, 5)
 
     return render_template(
         "dashboard.html",
@@ -106,6 +168,36 @@ def dashboard():
         search_location=search_location
     )
 
+# ------------------- AUTOCOMPLETE -------------------
+@app.route("/api/suggest")
+def api_suggest():
+    """
+    Ranked autocomplete: /api/suggest?field=role&q=data&k=5
+    """
+    if "user_id" not in session:
+        return {"error": "login required"}, 401
+
+    field = request.args.get("field", "role")
+    if field not in suggest_indexes:
+        return {"error": f"unknown field '{field}'"}, 400
+    k = min(max(request.args.get("k", 5, type=int), 1), 50)
+    return {"field": field, "suggestions": list(suggest_indexes[field].suggest(request.args.get("q", ""), k))}
+
+# ------------------- STORED JOBS -------------------
+@app.route("/api/jobs/search")
+def api_job_search():
+    """
+    Full-text search over stored jobs: /api/jobs/search?q="data scientist" pyth*&source=Naukri
+    """
+    if "user_id" not in session:
+        return {"error": "login required"}, 401
+
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    jobs = search_jobs(request.args.get("q", ""), sources=request.args.getlist("source"),
+                       limit=limit, offset=offset)
+    return {"jobs": jobs, "count": len(jobs)}
+
 # ------------------- LOADING -------------------
 @app.route("/loading", methods=["POST"])
 def loading():
@@ -130,55 +222,123 @@ def search():
     company = request.form.get("company", "").strip()
     location = request.form.get("location", "").strip()
 
-    jobs = []
-
-    # --- Naukri ---
-    try:
-        jobs.extend(search_naukri_jobs(query=role, max_jobs=20))
-    except Exception as e:
-        print("Error fetching Naukri jobs:", e)
-
-    # --- LinkedIn ---
-    try:
-        jobs.extend(search_linkedin_jobs(role=role, location=location, company=company, max_jobs=20, headless=False))
-    except Exception as e:
-        print("Error fetching LinkedIn jobs:", e)
-
-    # --- Unstop ---
-    try:
-        jobs.extend(search_unstop_jobs(role=role, location=location, company=company, max_jobs=20))
-    except Exception as e:
-        print("Error fetching Unstop jobs:", e)
-
-    # --- Sort by relevance ---
-    def relevance(job):
-        score = 0
-        # Get first word of the search role
-        first_word_role = role.split()[0].lower() if role else ""
-        
-        if first_word_role and first_word_role in job.get("role", "").lower():
-            score += 3
-        if company and company.lower() in job.get("company", "").lower():
-            score += 2
-        if location and location.lower() in job.get("location", "").lower():
-            score += 1
-        return score
-
-
-    jobs = sorted(jobs, key=relevance, reverse=True)[:50]
+    db.session.add(SearchHistory(user_id=session["user_id"], role=role, company=company, location=location))
+    db.session.commit()
+
+    # --- Queue the search for a worker; results stream into the results page ---
+    task_id = search_tasks.enqueue(role, company, location, user_id=session["user_id"],
+                                   sources=app.config["SOURCE_BUDGETS"].keys())
+    return redirect(url_for("results", task_id=task_id))
+
+@app.route("/results/<task_id>")
+def results(task_id):
+    if "user_id" not in session:
+        flash("Please login first")
+        return redirect(url_for("login"))
+
+    task = owned_task(task_id)
+    if task is None:
+        flash("That search has expired, please search again")
+        return redirect(url_for("dashboard"))
 
     return render_template(
         "results.html",
-        jobs=jobs,
-        search_role=role,
-        search_company=company,
-        search_location=location
+        jobs=ranked_results(task),
+        source_status=task["status"],
+        done=task["done"],
+        version=task["version"],
+        task_id=task["id"],
+        search_role=task["role"],
+        search_company=task["company"],
+        search_location=task["location"]
     )
 
-# ------------------- MAIN -------------------
-with app.app_context():
-    db.create_all()
+@app.route("/search/<task_id>/status")
+def search_status(task_id):
+    """
+    Polling endpoint for the results page. Card HTML is only sent when the
+    task has changed since the version the client already has.
+    """
+    task = owned_task(task_id)
+    if task is None:
+        return {"error": "not found"}, 404
+
+    payload = {"done": task["done"], "version": task["version"], "sources": task["status"]}
+    if request.args.get("version", type=int) != task["version"]:
+        context = dict(
+            jobs=ranked_results(task),
+            source_status=task["status"],
+            done=task["done"],
+            search_role=task["role"],
+            search_company=task["company"],
+            search_location=task["location"],
+        )
+        payload["status_html"] = render_template("_source_status.html", **context)
+        payload["cards_html"] = render_template("_job_cards.html", **context)
+    return payload
+
+# ------------------- ADMIN -------------------
+@app.route("/admin/cache/invalidate", methods=["POST"])
+def invalidate_cache():
+    """
+    Drop cached search results. Optional form fields role/company/location narrow it
+    to one query and source to one site; with none of them everything is dropped.
+    """
+    token = app.config["ADMIN_TOKEN"]
+    if not token or request.headers.get("X-Admin-Token") != token:
+        return {"error": "forbidden"}, 403
+
+    fields = [request.form.get(f, "") for f in ("role", "company", "location")]
+    key = query_key(*fields) if any(fields) else None
+    removed = search_cache.invalidate(key=key, source=request.form.get("source") or None)
+    return {"invalidated": removed}
+
+@app.cli.command("cache-clear")
+def cache_clear():
+    """Drop every cached search result."""
+    print(f"Invalidated {search_cache.invalidate()} cache entries")
 
+@app.cli.command("dedupe-jobs")
+def dedupe_jobs_command():
+    """Group duplicate postings stored in the jobs table."""
+    print(f"Marked {dedupe_stored_jobs()} duplicate jobs")
+
+@app.cli.command("migrate-sessions")
+def migrate_sessions():
+    """Convert cookie files pickled by older versions to JSON."""
+    from executors.login_manager import migrate_pickles  # loads the browser stack
+    print(f"Converted {migrate_pickles()} saved sessions")
+
+@app.cli.command("match-alerts")
+def match_alerts():
+    """Notify subscribers about newly stored jobs."""
+    print(f"Wrote {match_new_jobs()} notifications")
+
+@app.cli.command("reindex-jobs")
+def reindex_jobs():
+    """Rebuild the full-text index over stored jobs."""
+    rebuild_index()
+    print("Rebuilt jobs_fts")
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create or upgrade the database schema and search index."""
+    init_db()
+    print("Database ready")
+
+# ------------------- DATABASE -------------------
+def init_db():
+    """
+    Create or upgrade the schema and the full-text index. Safe to run
+    repeatedly, but it is a startup step (flask init-db, worker and pre-crawler
+    start), not something every web worker does on import.
+    """
+    with app.app_context():
+        upgrade_schema()
+        ensure_index()
+
+# ------------------- MAIN -------------------
 if __name__ == "__main__":
+    init_db()
     app.run(host="0.0.0.0")  # Accept external connections
 
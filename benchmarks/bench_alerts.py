@@ -0,0 +1,89 @@
+# benchmarks/bench_alerts.py
+"""
+Subscription matching benchmark: 100k subscriptions against a 10k-job crawl.
+
+    python benchmarks/bench_alerts.py [--subs 100000] [--jobs 10000]
+
+Builds synthetic subscriptions and jobs from data/roles.csv, companies.csv and
+locations.csv, then times building the SubscriptionIndex and matching the batch.
+The naive subscriptions x jobs loop is timed on a sample and extrapolated.
+No database is touched.
+"""
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerts import FIELDS, SubscriptionIndex, field_terms, notification_message
+
+
+def load(path):
+    with open(path, newline="", encoding="latin-1") as f:
+        return [line.split(",")[0].strip() for line in f if line.strip()]
+
+
+def synthetic(n_subs, n_jobs, seed=7):
+    rng = random.Random(seed)
+    roles, companies, locations = load("data/roles.csv"), load("data/companies.csv"), load("data/locations.csv")
+    subs = []
+    for i in range(n_subs):
+        # Most alerts set a role; some also pin a company and/or a city
+        subs.append((i % (n_subs // 3 or 1),
+                     rng.choice(roles) if rng.random() < 0.9 else None,
+                     rng.choice(companies[:2000]) if rng.random() < 0.3 else None,
+                     rng.choice(locations[:200]) if rng.random() < 0.5 else None))
+    jobs = [{"role": rng.choice(["Senior ", "Junior ", ""]) + rng.choice(roles),
+             "company": rng.choice(companies[:2000]) + rng.choice(["", " Pvt Ltd"]),
+             "location": rng.choice(locations[:200]) + rng.choice(["", ", India"])}
+            for _ in range(n_jobs)]
+    return subs, jobs
+
+
+def naive_matches(subs, job):
+    terms = {field: field_terms(field, job.get(field)) for field in FIELDS}
+    users = set()
+    for user_id, *values in subs:
+        wanted = {f: field_terms(f, v) for f, v in zip(FIELDS, values)}
+        wanted = {f: t for f, t in wanted.items() if t}
+        if wanted and all(t <= terms[f] for f, t in wanted.items()):
+            users.add(user_id)
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subs", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--naive-sample", type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subs, jobs = synthetic(args.subs, args.jobs)
+
+    start = time.perf_counter()
+    index = SubscriptionIndex(subs)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = []
+    for job_id, job in enumerate(jobs):
+        users = index.match(job)
+        if users:
+            message = notification_message(job)
+            rows.extend({"user_id": u, "job_id": job_id, "message": message} for u in users)
+    match = time.perf_counter() - start
+
+    sample = jobs[:args.naive_sample]
+    start = time.perf_counter()
+    for job in sample:
+        assert naive_matches(subs, job) == index.match(job)
+    naive = (time.perf_counter() - start) / len(sample) * len(jobs)
+
+    print(f"subscriptions          {len(index):>10,} indexed as {len(index.patterns):,} patterns")
+    print(f"index build            {build * 1000:>10.1f} ms")
+    print(f"match {len(jobs):,} jobs       {match * 1000:>10.1f} ms  ({match / len(jobs) * 1e6:.1f} us/job)")
+    print(f"notifications          {len(rows):>10,}")
+    print(f"naive (extrapolated)   {naive * 1000:>10.1f} ms  ({naive / match:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_records.py
+"""
+Job representation benchmark: plain dicts against interned JobRecords.
+
+    python benchmarks/bench_records.py [--jobs 200000]
+
+Builds the same synthetic crawl (titles, companies and cities from data/*.csv,
+sources and empty fields repeated the way the scrapers return them) once as
+dicts and once as JobRecords, and reports the memory each list holds, the time
+to build it and the time for a pass over every link, as delta and dedupe make.
+Every string is a fresh object, like text parsed out of HTML or JSON, so
+interning is measured rather than assumed. No database is touched.
+"""
+import argparse, gc, os, random, sys, time, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from executors.record import JobRecord
+
+
+def load(path):
+    with open(path, newline="", encoding="latin-1") as f:
+        return [line.split(",")[0].strip() for line in f if line.strip()]
+
+
+def fresh(text):
+    return (text + ".")[:-1]  # an equal but distinct str, as a parser would return
+
+
+def synthetic(n_jobs, seed=7):
+    rng = random.Random(seed)
+    roles, companies, locations = load("data/roles.csv"), load("data/companies.csv"), load("data/locations.csv")
+    rows = []
+    for i in range(n_jobs):
+        source = rng.choice(["Naukri", "LinkedIn", "Unstop"])
+        row = {"role": rng.choice(roles), "company": rng.choice(companies[:2000]),
+               "location": rng.choice(locations[:200]), "link": f"https://example.com/{source.lower()}/job/{i}",
+               "source": source, "description": "", "stipend": ""}
+        if source == "Naukri":
+            row.update(experience=f"{rng.randint(0, 5)}-{rng.randint(6, 10)} Yrs", deadline="Not mentioned",
+                       skills=rng.sample(roles[:300], 4))
+        rows.append(row)
+    return rows
+
+
+def build_dicts(rows):
+    return [{k: [fresh(s) for s in v] if isinstance(v, list) else fresh(v) for k, v in row.items()} for row in rows]
+
+
+def build_records(rows):
+    return [JobRecord(**{k: [fresh(s) for s in v] if isinstance(v, list) else fresh(v) for k, v in row.items()})
+            for row in rows]
+
+
+def measure(build, rows):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    jobs = build(rows)
+    built = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    links = sum(1 for job in jobs if job.get("link"))
+    scanned = time.perf_counter() - start
+    assert links == len(rows)
+    return size, built, scanned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=200_000)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    rows = synthetic(args.jobs)
+    results = {name: measure(build, rows) for name, build in (("dict", build_dicts), ("JobRecord", build_records))}
+
+    print(f"{args.jobs} jobs")
+    for name, (size, built, scanned) in results.items():
+        print(f"  {name:<10} {size / 2**20:8.1f} MiB  {size / args.jobs:6.0f} B/job  "
+              f"build {built:.2f}s  scan {scanned * 1000:.0f}ms")
+    saved = 1 - results["JobRecord"][0] / results["dict"][0]
+    print(f"JobRecord holds the crawl in {saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# benchmarks/bench_scrape.py
+"""
+Offline scrape benchmark: every executor, and the full /search path, run
+against the recorded fixtures in benchmarks/fixtures instead of the live sites.
+
+    python benchmarks/bench_scrape.py --runs 5 --latency 0.1
+    python benchmarks/bench_scrape.py --json /tmp/base.json          # on the commit to compare against
+    python benchmarks/bench_scrape.py --baseline /tmp/base.json --tolerance 0.25
+
+The "-http" benchmarks time the browserless fetchers (executors/http_fetch.py)
+against the same server.
+
+Browsers use the lean profile (executors/driver_pool.py) unless --profile full
+is given. --profile both runs each browser benchmark under both profiles and
+prints the bandwidth and page-load time the lean profile saved per source.
+
+Each benchmark runs in its own process, with headless Chrome pointed at a
+local FixtureServer, so peak RSS is measured per executor. That figure covers
+the Python process plus its chromedriver/Chrome children. The first run,
+which launches the browser, is reported as "cold" and left out of the
+percentiles.
+
+The /search benchmark uses a throwaway database and queue. It posts a search,
+runs the queued task the way a worker would, and stops the clock when the
+status endpoint reports it done. The cache is cleared before every run.
+
+Offline CI needs CHROMEDRIVER_PATH set, so the driver pool does not try to
+download chromedriver.
+
+With --baseline (the --json output of an earlier run, on the same machine),
+the exit status is 1 when any p50 is slower than the baseline by more than
+--tolerance, so CI can fail on regressions. No baseline is committed: the
+timings only mean something next to a run on the same hardware.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse, json, math, multiprocessing, os, resource, sys, tempfile, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import FixtureServer, PAGES
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+QUERY = {"role": "Software Engineer", "company": "", "location": "Bangalore"}
+MAX_JOBS = 20
+BENCHMARKS = ["Naukri", "LinkedIn", "Unstop", "Naukri-http", "LinkedIn-http", "Unstop-http", "search"]
+BROWSER_BENCHMARKS = ["Naukri", "LinkedIn", "Unstop"]
+FULL = ":full"  # result name suffix for runs without the lean profile
+
+
+# ----------------- MEASUREMENT -----------------
+class PeakRSS:
+    """
+    Samples the RSS of this process and all its descendants in the background.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        if psutil is None:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+        proc = psutil.Process()
+        total = 0
+        for p in [proc] + proc.children(recursive=True):
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._sample())
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+# ----------------- BENCHMARKS (run in a child process) -----------------
+def _executor_call(name):
+    if name.endswith("-http"):
+        from executors import http_fetch
+        return {
+            "Naukri-http": lambda: http_fetch.search_naukri_http(query=QUERY["role"], max_jobs=MAX_JOBS),
+            "LinkedIn-http": lambda: http_fetch.search_linkedin_http(role=QUERY["role"], location=QUERY["location"],
+                                                                     max_jobs=MAX_JOBS),
+            "Unstop-http": lambda: http_fetch.search_unstop_http(query=QUERY["role"], max_jobs=MAX_JOBS),
+        }[name]
+    if name == "Naukri":
+        from executors.naukri_executor import search_naukri_jobs
+        return lambda: search_naukri_jobs(query=QUERY["role"], max_jobs=MAX_JOBS, headless=True)
+    if name == "LinkedIn":
+        from executors.linkedin_executor import search_linkedin_jobs
+        return lambda: search_linkedin_jobs(role=QUERY["role"], location=QUERY["location"],
+                                            max_jobs=MAX_JOBS, headless=True)
+    from executors.unstop_executor import search_unstop_jobs
+    return lambda: search_unstop_jobs(query=QUERY["role"], max_jobs=MAX_JOBS, headless=True)
+
+
+def _search_call():
+    from app import app, init_db, search_cache, search_tasks
+    from models import db, User
+    from worker import run_task
+
+    init_db()
+    with app.app_context():
+        user = User(username="bench", email="bench@example.com", password="-")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"], session["username"] = user_id, "bench"
+
+    def call():
+        with app.app_context():
+            search_cache.invalidate()
+        response = client.post("/search", data=QUERY)
+        task_id = response.headers["Location"].rstrip("/").rsplit("/", 1)[-1]
+        task = search_tasks.claim("bench")
+        run_task(task)
+        status = client.get(f"/search/{task_id}/status").get_json()
+        if not status["done"]:
+            raise RuntimeError(f"search {task_id} did not finish")
+        return search_tasks.snapshot(task_id)["jobs"]
+    return call
+
+
+def run_benchmark(name, runs, env):
+    """
+    Child-process entry point: run one benchmark `runs` times after a cold run.
+    """
+    os.environ.update(env)
+    os.chdir(ROOT)  # app.py reads data/*.csv relative to the repo
+    name = name[:-len(FULL)] if name.endswith(FULL) else name
+    call = _search_call() if name == "search" else _executor_call(name)
+
+    latencies, jobs, errors = [], 0, []
+    with PeakRSS() as rss:
+        for n in range(runs + 1):
+            start = time.perf_counter()
+            try:
+                found = len(call())
+            except Exception as e:
+                errors.append(repr(e))
+                found = 0
+            elapsed = time.perf_counter() - start
+            if n == 0:
+                cold = elapsed
+            else:
+                latencies.append(elapsed)
+                jobs += found
+    from executors.waits import LAST_STATS
+    page = LAST_STATS.get(name, {})  # the last run's result page; fixtures load the same every time
+    return {
+        "runs": runs,
+        "cold": round(cold, 3),
+        "p50": round(percentile(latencies, 50), 3),
+        "p90": round(percentile(latencies, 90), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "jobs_per_run": round(jobs / runs, 1) if runs else 0,
+        "jobs_per_sec": round(jobs / sum(latencies), 2) if sum(latencies) else 0.0,
+        "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+        "page_kb": page.get("page_kb"),
+        "page_requests": page.get("page_requests"),
+        "page_load": page.get("page_load"),
+        "errors": errors[:3],
+    }
+
+
+# ----------------- REPORTING -----------------
+def report(results):
+    print(f"{'benchmark':<14} {'cold':>7} {'p50':>7} {'p90':>7} {'p99':>7} {'jobs/run':>9} {'jobs/s':>7} {'peak RSS':>10}")
+    for name, r in results.items():
+        print(f"{name:<14} {r['cold']:>6.2f}s {r['p50']:>6.2f}s {r['p90']:>6.2f}s {r['p99']:>6.2f}s "
+              f"{r['jobs_per_run']:>9} {r['jobs_per_sec']:>7} {r['peak_rss_mb']:>7.1f} MB")
+        for error in r["errors"]:
+            print(f"  error: {error}")
+
+
+def report_savings(results):
+    lines = []
+    for name in BROWSER_BENCHMARKS:
+        lean, full = results.get(name), results.get(name + FULL)
+        if not (lean and full and lean["page_kb"] is not None and full["page_kb"] is not None):
+            continue
+        lines.append(f"{name:<14} {full['page_kb'] - lean['page_kb']:>8.1f} KB "
+                     f"{full['page_requests'] - lean['page_requests']:>9} "
+                     f"{full['page_load'] - lean['page_load']:>9.2f}s "
+                     f"{full['p50'] - lean['p50']:>9.2f}s")
+    if lines:
+        print(f"\n{'lean saved':<14} {'bandwidth':>11} {'requests':>9} {'page load':>10} {'p50':>10}")
+        print("\n".join(lines))
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base and base.get("p50") and r["p50"] > base["p50"] * (1 + tolerance):
+            found.append(f"{name}: p50 {r['p50']:.2f}s vs baseline {base['p50']:.2f}s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the executors and /search against local fixtures")
+    parser.add_argument("--runs", type=int, default=5, help="measured runs per benchmark (after one cold run)")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every fixture response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--pages", type=int, default=PAGES, help="result pages per fixture search")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--fetch-mode", choices=["auto", "browser"], default="auto",
+                        help="FETCH_MODE for the /search benchmark")
+    parser.add_argument("--profile", choices=["lean", "full", "both"], default="lean",
+                        help="browser launch profile; 'both' also reports what the lean one saved")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results JSON to compare p50 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown vs baseline")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="jobfinder-bench-")
+    results = {}
+    with FixtureServer(latency=args.latency, jitter=args.jitter, pages=args.pages) as server:
+        env = dict(server.base_urls(),
+                   DRIVER_HEADLESS="1",
+                   DATABASE_URL="sqlite:///" + os.path.join(workdir, "bench.db"),
+                   QUEUE_DB=os.path.join(workdir, "queue.db"),
+                   FETCH_MODE=args.fetch_mode)
+        runs = [(name, dict(env, DRIVER_LEAN="0" if args.profile == "full" else "1")) for name in args.only]
+        if args.profile == "both":
+            runs += [(name + FULL, dict(env, DRIVER_LEAN="0")) for name in args.only if name in BROWSER_BENCHMARKS]
+        spawn = multiprocessing.get_context("spawn")  # fresh imports, so the env overrides apply
+        for name, run_env in runs:
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                results[name] = pool.submit(run_benchmark, name, args.runs, run_env).result()
+
+    report(results)
+    report_savings(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for line in slower:
+            print("REGRESSION", line)
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_startup.py
+"""
+Startup benchmark: import time and resident memory of each process type.
+
+    python benchmarks/bench_startup.py [--runs 5]
+
+Imports the web app, the scraping worker and the pre-crawler in fresh
+interpreters and reports the median import time, the RSS right after import and
+which heavy dependencies came along. A web worker should not load the browser
+stack (selenium, webdriver_manager) or the scrapers' parsers; the worker and
+pre-crawler load them on their first scrape instead. No database is touched.
+"""
+import argparse, json, os, statistics, subprocess, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = {"web (app)": "app", "worker": "worker", "precrawler": "precrawler"}
+HEAVY = ("selenium", "webdriver_manager", "bs4", "lxml", "requests")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+with open("/proc/self/status") as f:
+    rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss, "heavy": heavy}}))
+"""
+
+
+def probe(module, env):
+    out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, DATABASE_URL="sqlite:///" + os.path.join(workdir, "startup.db"), METRICS_ENABLED="0")
+        for label, module in TARGETS.items():
+            runs = [probe(module, env) for _ in range(args.runs)]
+            seconds = statistics.median(r["seconds"] for r in runs)
+            rss = statistics.median(r["rss_kb"] for r in runs) / 1024
+            print(f"{label:<12} import {seconds * 1000:6.0f}ms  RSS {rss:6.1f} MiB  "
+                  f"loads: {', '.join(runs[-1]['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
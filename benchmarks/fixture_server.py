@@ -0,0 +1,189 @@
+# benchmarks/fixture_server.py
+"""
+Local stand-in for the job sites, serving the snapshots in benchmarks/fixtures.
+
+    python benchmarks/fixture_server.py --port 8765 --latency 0.2
+
+Each site lives under its own prefix, so the executors can be pointed at it:
+
+    NAUKRI_BASE_URL=http://127.0.0.1:8765/naukri
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765/linkedin
+    UNSTOP_BASE_URL=http://127.0.0.1:8765/unstop
+
+Result pages embed the first page of <site>/cards.html and fetch further pages
+from <prefix>/.../more?page=N as they are scrolled. The JSON and HTML fragment
+endpoints used by the browserless fetchers are served from the same files. Every response is delayed
+by `latency` plus up to `jitter` seconds to stand in for the real network.
+
+Result pages also pull in a web font, two images and an analytics script from
+/assets/, padded to typical sizes, so the lean browser profile has something
+to block.
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import argparse, os, random, threading, time
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PAGES = 3   # result pages per search, including the first
+
+# (site, path after the site prefix) -> page template
+ROUTES = {
+    ("naukri", ""): "naukri/home.html",
+    ("naukri", "jobs"): "naukri/jobs.html",
+    ("linkedin", "jobs/search"): "linkedin/search.html",
+    ("unstop", "opportunities"): "unstop/opportunities.html",
+}
+CARDS_MARKER = "<!-- cards -->"
+
+# /assets/<name> -> (content type, size in bytes), filled with padding
+ASSETS = {
+    "brand.woff2": ("font/woff2", 48 * 1024),
+    "banner.jpg": ("image/jpeg", 180 * 1024),
+    "logo.png": ("image/png", 24 * 1024),
+    "analytics.js": ("application/javascript", 90 * 1024),
+}
+
+# Endpoints the browserless fetchers (executors/http_fetch.py) call:
+# (site, path) -> (page file, content type, function of the query string giving the page number)
+API_ROUTES = {
+    ("naukri", "jobapi/v3/search"): ("naukri/search.json", "application/json",
+                                     lambda q: int(q.get("pageNo", ["1"])[0])),
+    ("linkedin", "jobs-guest/jobs/api/seeMoreJobPostings/search"): ("linkedin/cards.html", "text/html",
+                                                                    lambda q: int(q.get("start", ["0"])[0]) // 10 + 1),
+    ("unstop", "api/public/opportunity/search-result"): ("unstop/search.json", "application/json",
+                                                         lambda q: int(q.get("page", ["1"])[0])),
+}
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, pages=PAGES):
+        self.latency = latency
+        self.jitter = jitter
+        self.pages = pages
+        self.requests = 0
+        self._files = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self):
+        """
+        Environment overrides pointing every executor at this server.
+        """
+        return {
+            "NAUKRI_BASE_URL": self.url + "/naukri",
+            "LINKEDIN_BASE_URL": self.url + "/linkedin",
+            "UNSTOP_BASE_URL": self.url + "/unstop",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ----------------- CONTENT -----------------
+    def _file(self, name):
+        if name not in self._files:
+            self._files[name] = _read(name)
+        return self._files[name]
+
+    def cards(self, site, page, name=None):
+        if page > self.pages:
+            return ""
+        return self._file(name or f"{site}/cards.html").replace("__PAGE__", str(page))
+
+    def render(self, path, query=None):
+        """
+        (status, content type, body) for a request path.
+        """
+        site, _, rest = path.strip("/").partition("/")
+        if site == "naukri" and rest.endswith("-jobs"):
+            rest = "jobs"  # /<query-slug>-jobs, the search URLs batch mode opens directly
+        if path == "/scroll.js":
+            return 200, "application/javascript", self._file("scroll.js")
+        if site == "assets" and rest in ASSETS:
+            content_type, size = ASSETS[rest]
+            if content_type == "application/javascript":
+                return 200, content_type, "/*" + " " * (size - 4) + "*/"
+            return 200, content_type, b"\0" * size
+        if (site, rest) in API_ROUTES:
+            name, content_type, page = API_ROUTES[(site, rest)]
+            body = self.cards(site, page(query or {}), name)
+            if not body and content_type == "application/json":
+                body = "{}"
+            return 200, content_type, body
+        if rest.endswith("more"):
+            return 200, "text/html", self.cards(site, int((query or {}).get("page", ["1"])[0]))
+        template = ROUTES.get((site, rest))
+        if template is None:
+            return 404, "text/plain", "not found\n"
+        body = self._file(template).replace("__PAGES__", str(self.pages))
+        return 200, "text/html", body.replace(CARDS_MARKER, self.cards(site, 1))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.latency or server.jitter:
+                    time.sleep(server.latency + random.uniform(0, server.jitter))
+                parts = urlsplit(self.path)
+                status, content_type, body = server.render(parts.path, parse_qs(parts.query))
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8" if isinstance(body, str)
+                                 else content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded job-site fixtures locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument("--pages", type=int, default=PAGES, help="result pages per search")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, args.latency, args.jitter, args.pages)
+    for name, url in server.base_urls().items():
+        print(f"{name}={url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+// Infinite scroll stand-in shared by the fixture result pages: when the page is
+// scrolled near the bottom, fetch the next page of cards and append it.
+(function () {
+    var list = document.getElementById("results");
+    var pages = parseInt(list.getAttribute("data-pages"), 10);
+    var page = 1, loading = false;
+    window.addEventListener("scroll", function () {
+        if (loading || page >= pages) return;
+        if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+        loading = true;
+        fetch("more?page=" + (page + 1)).then(function (r) { return r.text(); }).then(function (html) {
+            list.insertAdjacentHTML("beforeend", html);
+            page += 1;
+            loading = false;
+        });
+    });
+})();
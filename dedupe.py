@@ -0,0 +1,197 @@
+# dedupe.py
+"""
+Cross-source duplicate detection and merging for job postings.
+
+Two postings are the same job when their normalized company + role + location
+key matches, or when they share a company and location and their titles are
+near-duplicates (Jaccard similarity of title shingles). Large company/location
+blocks are first bucketed by MinHash + LSH so each posting is only compared
+with likely matches, keeping a batch roughly linear in its size.
+"""
+from itertools import repeat
+import random, re
+
+from models import db, Job
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_COMPANY_SUFFIXES = {"pvt", "private", "ltd", "limited", "inc", "llp", "llc", "corp",
+                     "corporation", "co", "company", "technologies", "solutions", "india"}
+_LOCATION_ALIASES = {"bengaluru": "bangalore", "gurugram": "gurgaon", "bombay": "mumbai",
+                     "new delhi": "delhi", "madras": "chennai"}
+
+NUM_PERM = 32           # MinHash signature length
+BANDS = 8               # LSH bands (NUM_PERM / BANDS rows each)
+SIMILARITY = 0.6        # Jaccard threshold for near-duplicate titles
+SMALL_BLOCK = 8         # blocks this small are compared pairwise without MinHash
+LINK_PRIORITY = ["LinkedIn", "Naukri", "Unstop"]   # whose link a merged posting keeps
+
+# One salt per MinHash permutation; hashing (salt, shingle) tuples keeps the work in C
+_SALTS = [random.Random(20240917 + n).getrandbits(32) for n in range(NUM_PERM)]
+
+
+# ----------------- NORMALIZATION -----------------
+def norm_company(text):
+    words = _WORD.findall((text or "").lower())
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def norm_location(text):
+    first = re.split(r"[,/(|]", (text or "").lower())[0]
+    first = " ".join(_WORD.findall(first))
+    return _LOCATION_ALIASES.get(first, first)
+
+
+def norm_role(text):
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def job_key(job):
+    return (norm_company(job.get("company")), norm_role(job.get("role")), norm_location(job.get("location")))
+
+
+# ----------------- MINHASH -----------------
+def _shingles(title):
+    words = title.split()
+    grams = {title[i:i + 3] for i in range(len(title) - 2)}
+    return grams | set(words) if grams else set(words)
+
+
+def _signature(shingles):
+    return [min(map(hash, zip(repeat(salt), shingles))) for salt in _SALTS]
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+# ----------------- GROUPING -----------------
+def find_groups(jobs):
+    """
+    Indices of duplicate postings grouped together, e.g. [[0, 4], [1], [2, 3]].
+    Groups are ordered by their first member.
+    """
+    parent = list(range(len(jobs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # Exact key matches, then block the rest by company + location
+    exact = {}
+    blocks = {}
+    for i, job in enumerate(jobs):
+        company, role, location = job_key(job)
+        if (company, role, location) in exact:
+            union(exact[(company, role, location)], i)
+            continue
+        exact[(company, role, location)] = i
+        if role:
+            blocks.setdefault((company, location), []).append(i)
+
+    # Near-duplicate titles within each block
+    rows = NUM_PERM // BANDS
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        shingles = {i: _shingles(norm_role(jobs[i].get("role"))) for i in members}
+        if len(members) <= SMALL_BLOCK:
+            candidates = [members]
+        else:
+            buckets = {}
+            for i in members:
+                sig = _signature(shingles[i])
+                for band in range(BANDS):
+                    buckets.setdefault((band, tuple(sig[band * rows:(band + 1) * rows])), []).append(i)
+            candidates = [b for b in buckets.values() if len(b) > 1]
+        for bucket in candidates:
+            for pos, i in enumerate(bucket):
+                for j in bucket[pos + 1:]:
+                    if find(i) != find(j) and _jaccard(shingles[i], shingles[j]) >= SIMILARITY:
+                        union(i, j)
+
+    groups = {}
+    for i in range(len(jobs)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+# ----------------- MERGING -----------------
+def _priority(job):
+    source = job.get("source", "")
+    return LINK_PRIORITY.index(source) if source in LINK_PRIORITY else len(LINK_PRIORITY)
+
+
+def merge_jobs(group):
+    """
+    Combine duplicate postings into one record: the highest-priority source's
+    link and title, every other field filled from whichever copy has it, skills
+    unioned, and `sources`/`links` listing where it was found.
+    """
+    ordered = sorted(group, key=_priority)
+    merged = dict(ordered[0])
+    for job in ordered[1:]:
+        for field, value in job.items():
+            if field == "skills":
+                continue
+            if value and not merged.get(field):
+                merged[field] = value
+
+    skills = []
+    for job in group:
+        for skill in job.get("skills") or []:
+            if skill not in skills:
+                skills.append(skill)
+    if skills:
+        merged["skills"] = skills
+
+    merged["sources"] = []
+    merged["links"] = {}
+    for job in ordered:
+        # a copy merged earlier (e.g. a stored group) brings all of its links
+        for source, link in (job.get("links") or {job.get("source", ""): job.get("link", "")}).items():
+            if source not in merged["sources"]:
+                merged["sources"].append(source)
+                merged["links"][source] = link
+    return merged
+
+
+def dedupe_jobs(jobs):
+    """
+    Collapse duplicate postings in a result list, keeping first-seen order.
+    """
+    out = []
+    for group in find_groups(jobs):
+        out.append(jobs[group[0]] if len(group) == 1 else merge_jobs([jobs[i] for i in group]))
+    return out
+
+
+# ----------------- STORED JOBS -----------------
+def dedupe_stored_jobs():
+    """
+    Group duplicate rows in the jobs table under the oldest copy of each
+    posting: the others get canonical_id = its id, and search and alerts show
+    the group once. Each source keeps its own row as scraped, so the next
+    scrape of any of them updates that row instead of bringing a deleted copy
+    back. Safe to run repeatedly. Returns the number of rows newly marked as
+    duplicates. Needs an app context.
+    """
+    rows = Job.query.order_by(Job.id).all()
+    marked = 0
+    for group in find_groups([row.to_record() for row in rows]):
+        keeper = rows[group[0]].id
+        for i in group:
+            canonical = None if rows[i].id == keeper else keeper
+            if rows[i].canonical_id != canonical:
+                marked += canonical is not None
+                rows[i].canonical_id = canonical
+    db.session.commit()
+    return marked
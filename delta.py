@@ -0,0 +1,68 @@
+# delta.py
+"""
+Delta crawls: re-crawl a query and pay only for the postings that are new.
+
+The jobs stored for a (query, source) in the search cache are its seen set,
+and the first of them, the top of the result list last time, is its
+watermark. tracker() turns both into a SeenTracker the executors use to stop
+scrolling or paging once they reach postings we already have. They then
+return only the new postings; merge() puts those in front of the stored ones
+so the cache entry still holds the full list.
+"""
+import os
+
+from models import db, Job, SearchCacheEntry, cache_entry_jobs, normalize_link, POSTING_PREFIX
+from executors.seen import SeenTracker
+
+DELTA_KEEP = int(os.environ.get("DELTA_KEEP", 100))  # postings kept per (query, source) after merging
+
+
+def tracker(key, source):
+    """
+    SeenTracker for a delta crawl of (key, source). With nothing stored yet it
+    never catches up, so the crawl runs in full.
+    """
+    rows = (db.session.query(Job.link_key)
+            .join(cache_entry_jobs, cache_entry_jobs.c.job_id == Job.id)
+            .join(SearchCacheEntry, SearchCacheEntry.id == cache_entry_jobs.c.entry_id)
+            .filter(SearchCacheEntry.query_key == key, SearchCacheEntry.source == source)
+            .order_by(cache_entry_jobs.c.position).all())
+    known = [link_key for link_key, in rows if link_key and not link_key.startswith(POSTING_PREFIX)]
+    return SeenTracker(known, watermark=known[0] if known else None, key=normalize_link)
+
+
+def merge(new_jobs, stored_jobs, keep=DELTA_KEEP):
+    """
+    New postings first, then the stored ones they don't repeat, capped at `keep`.
+    """
+    merged, keys = [], set()
+    for job in list(new_jobs) + list(stored_jobs):
+        key = normalize_link(job.get("link"))
+        if key in keys:
+            continue
+        if key:
+            keys.add(key)
+        merged.append(job)
+    return merged[:keep]
+
+
+def crawl(cache, key, source, call):
+    """
+    Run `call(seen)` as a delta crawl against what `cache` holds for (key, source).
+    Returns (jobs to store, new postings, ok); ok is False when the source failed
+    rather than simply having nothing new. Needs an app context.
+    """
+    seen = tracker(key, source)
+    db.session.commit()  # don't hold a read transaction open for the whole scrape
+    return settle(cache, key, source, call(seen), seen)
+
+
+def settle(cache, key, source, new_jobs, seen):
+    """
+    (jobs to store, new postings, ok) for a delta crawl that returned `new_jobs`.
+    """
+    ok = bool(new_jobs) or seen.caught_up
+    if not ok:
+        return [], 0, False
+    cached = cache.get(key, source)
+    return merge(new_jobs, cached[0] if cached else []), len(new_jobs), True
@@ -0,0 +1,126 @@
+# executors/batch.py
+"""
+Batch mode: many queries for one source in the tabs of a single pooled Chrome.
+
+    results = search_naukri_batch(["python developer", "data analyst"], tabs=4)
+    results["python developer"]   # -> list of job dicts
+
+WebDriver drives one tab at a time, so tabs are pipelined rather than
+threaded. Up to `tabs` results pages load at once in the background, each
+opened straight from its search URL, while the oldest loaded tab is scrolled
+and parsed. When it is closed the next query's tab is opened. Browser startup,
+the session restore and connection warm-up are paid once per batch instead
+of once per query.
+"""
+from collections import deque
+from urllib.parse import quote, urlencode
+import os, time
+
+from executors.driver_pool import block_urls, get_pool
+from executors.extract import SITES, rendered_jobs
+from executors.login_manager import restore_session
+from executors.metrics import span
+from executors.waits import WaitStats, wait_for_any, scroll_batches
+from executors.registry import base_url
+
+BATCH_TABS = int(os.environ.get("BATCH_TABS", 3))   # results pages loading at once per browser
+LOAD_TIMEOUT = 20                                    # seconds a tab may take to show its first cards
+
+
+def run_batch(source, queries, url_for, max_jobs=20, tabs=BATCH_TABS, headless=True,
+              seen=None, start_interval=0, prepare=None):
+    """
+    Results for every query in `queries`, keyed by query.
+
+    `url_for(query)` is the query's results page. `prepare(driver)` runs once
+    before the first tab opens (e.g. restoring a login). `seen` maps a query to
+    its SeenTracker for a delta crawl. `start_interval` spaces out page loads
+    for politeness. A query whose tab fails gets [].
+    """
+    card = SITES[source]["card"]
+    seen = seen or {}
+    results = {}
+    pool = get_pool(headless)
+    with span(source, "driver"):
+        driver = pool.checkout()
+    broken = False
+    try:
+        if prepare is not None:
+            prepare(driver)
+        home = driver.current_window_handle
+        waiting = deque(dict.fromkeys(queries))  # unique, in order
+        loading = deque()                        # (query, tab handle)
+        last_start = 0.0
+
+        while waiting or loading:
+            # Keep up to `tabs` pages loading in the background
+            while waiting and len(loading) < tabs:
+                time.sleep(max(0.0, last_start + start_interval - time.monotonic()))
+                query = waiting.popleft()
+                driver.switch_to.new_window("tab")
+                if pool.lean:
+                    block_urls(driver)  # the blocklist is per tab; a new one starts without it
+                driver.execute_script("window.location.href = arguments[0];", url_for(query))  # doesn't wait
+                last_start = time.monotonic()
+                loading.append((query, driver.current_window_handle))
+
+            query, handle = loading.popleft()
+            driver.switch_to.window(handle)
+            stats = WaitStats(source)
+            try:
+                with stats.step():
+                    if wait_for_any(driver, [card], timeout=LOAD_TIMEOUT) is None:
+                        raise RuntimeError("no results")
+                batches = scroll_batches(driver, card, stats=stats)
+                results[query] = list(rendered_jobs(driver, source, batches, max_jobs, seen.get(query)))
+            except Exception as e:
+                print(f"{source} batch query {query!r} failed:", e)
+                results[query] = []
+            stats.page(driver)
+            stats.report()
+            driver.close()
+            driver.switch_to.window(home)
+    except Exception as e:
+        print(f"{source} batch failed:", e)
+        broken = True
+    finally:
+        pool.checkin(driver, broken=broken)
+    for query in queries:
+        results.setdefault(query, [])
+    return results
+
+
+# ----------------- PER SOURCE -----------------
+def _slug(text):
+    return "-".join(text.lower().split())
+
+
+def search_naukri_batch(queries, max_jobs=20, tabs=BATCH_TABS, headless=True, seen=None, start_interval=0):
+    """
+    queries: search strings, as for search_naukri_jobs().
+    """
+    def url_for(query):
+        return f"{base_url('Naukri')}/{_slug(query)}-jobs?k={quote(query)}"
+    return run_batch("Naukri", queries, url_for, max_jobs, tabs, headless, seen, start_interval)
+
+
+def search_linkedin_batch(queries, max_jobs=20, tabs=BATCH_TABS, headless=True, seen=None, start_interval=0):
+    """
+    queries: (role, company, location) tuples.
+    """
+    def url_for(query):
+        role, company, location = query
+        params = {"keywords": " ".join(p for p in (role, company) if p), "location": location or "India",
+                  "f_TPR": "r604800"}  # past week, like the single-query flow
+        return f"{base_url('LinkedIn')}/jobs/search?{urlencode(params)}"
+    return run_batch("LinkedIn", queries, url_for, max_jobs, tabs, headless, seen, start_interval)
+
+
+def search_unstop_batch(queries, max_jobs=20, tabs=BATCH_TABS, headless=True, seen=None, start_interval=0):
+    """
+    queries: search strings. The saved Unstop session is restored once for the whole batch.
+    """
+    def url_for(query):
+        return f"{base_url('Unstop')}/opportunities?{urlencode({'searchTerm': query})}"
+    return run_batch("Unstop", queries, url_for, max_jobs, tabs, headless, seen, start_interval,
+                     prepare=lambda driver: restore_session(driver, "unstop"))
@@ -0,0 +1,246 @@
+# executors/driver_pool.py
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+import atexit, os, threading, time
+
+# ----------------- POOL SETTINGS -----------------
+POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", 3))       # max live browsers per pool
+MAX_USES = int(os.environ.get("DRIVER_MAX_USES", 25))        # recycle a browser after this many checkouts
+CHECKOUT_TIMEOUT = int(os.environ.get("DRIVER_CHECKOUT_TIMEOUT", 60))
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")                    # skip webdriver_manager's download check
+FORCE_HEADLESS = os.environ.get("DRIVER_HEADLESS") == "1"                # e.g. CI and benchmarks, no display
+
+# ----------------- LEAN PROFILE -----------------
+# Scrapes only need the DOM: no images, fonts, media or third-party trackers.
+LEAN = os.environ.get("DRIVER_LEAN", "1") != "0"
+WINDOW_SIZE = os.environ.get("DRIVER_WINDOW_SIZE", "1280,900")   # small, but wide enough for desktop layouts
+BLOCKED_URLS = [
+    # images, fonts and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+    # analytics, ads and trackers
+    "*/analytics.js", "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*googleadservices.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*clarity.ms*", "*bat.bing.com*", "*scorecardresearch.com*", "*moengage.com*",
+    "*licdn.com/li/track*", "*px.ads.linkedin.com*",
+]
+if os.environ.get("DRIVER_BLOCKLIST") is not None:  # comma-separated patterns, replaces the defaults
+    BLOCKED_URLS = [p.strip() for p in os.environ["DRIVER_BLOCKLIST"].split(",") if p.strip()]
+
+_service_path = None
+_service_lock = threading.Lock()
+
+
+def chrome_service():
+    """
+    Resolve the chromedriver binary once per process instead of on every search.
+    """
+    global _service_path
+    with _service_lock:
+        if _service_path is None:
+            _service_path = CHROMEDRIVER_PATH or ChromeDriverManager().install()
+    return Service(_service_path)
+
+
+def build_options(headless=True, lean=LEAN):
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        # Hand the page back at DOMContentLoaded; the executors wait for what they need
+        options.page_load_strategy = "eager"
+        options.add_argument(f"--window-size={WINDOW_SIZE}")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    else:
+        options.add_argument("--start-maximized")
+    return options
+
+
+def block_urls(driver, patterns=None):
+    """
+    Fail requests matching the blocklist inside Chrome, before they hit the network.
+    """
+    patterns = BLOCKED_URLS if patterns is None else patterns
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        print("Could not apply URL blocklist:", e)
+
+
+def launch_driver(headless=True, lean=LEAN):
+    driver = webdriver.Chrome(service=chrome_service(), options=build_options(headless, lean))
+    if lean:
+        block_urls(driver)
+    return driver
+
+
+# ----------------- POOL -----------------
+class DriverPool:
+    """
+    Bounded pool of pre-launched Chrome instances.
+
+    checkout() hands out an idle browser (launching one if the pool is not full),
+    checkin() resets it and puts it back. Browsers that fail a health check,
+    crash, or reach `max_uses` are quit and replaced on the next checkout.
+    """
+
+    def __init__(self, headless=True, lean=LEAN, size=POOL_SIZE, max_uses=MAX_USES):
+        self.headless = headless
+        self.lean = lean
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self._live = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def checkout(self, timeout=CHECKOUT_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    driver = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("No browser available in driver pool")
+                self._cond.wait(remaining)
+
+        if driver is not None and not self._healthy(driver):
+            self._discard(driver, release_slot=False)
+            driver = None
+        if driver is None:
+            try:
+                driver = launch_driver(self.headless, self.lean)
+            except Exception:
+                self._release_slot()
+                raise
+            self._uses[id(driver)] = 0
+
+        self._uses[id(driver)] += 1
+        return driver
+
+    def checkin(self, driver, broken=False):
+        if broken or self._uses.get(id(driver), 0) >= self.max_uses or not self._reset(driver):
+            self._discard(driver)
+            return
+        with self._cond:
+            if self._closed:
+                self._discard(driver)
+                return
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=CHECKOUT_TIMEOUT):
+        driver = self.checkout(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.checkin(driver, broken=broken)
+
+    def warm(self, count=None):
+        """
+        Launch browsers up front so the first searches skip the cold start.
+        """
+        count = min(count or self.size, self.size)
+        drivers = []
+        try:
+            for _ in range(count):
+                drivers.append(self.checkout())
+        finally:
+            for driver in drivers:
+                self.checkin(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    # --- internals ---
+    def _healthy(self, driver):
+        try:
+            driver.current_url  # cheap round-trip; raises if the browser died
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        """
+        Leave no state behind for the next user: extra tabs, cookies, current page.
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except Exception:
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver, release_slot=True):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if release_slot:
+            self._release_slot()
+
+    def _release_slot(self):
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+
+# ----------------- SHARED POOLS -----------------
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(headless=True, lean=LEAN):
+    """
+    One pool per launch mode, shared by every executor in the process.
+    """
+    key = (headless or FORCE_HEADLESS, lean)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = DriverPool(headless=key[0], lean=lean)
+        return _pools[key]
+
+
+@atexit.register
+def close_all():
+    for pool in list(_pools.values()):
+        pool.close()
@@ -0,0 +1,175 @@
+# executors/extract.py
+"""
+Parse job cards out of a single HTML snapshot (driver.page_source) instead of
+issuing one WebDriver round-trip per field. Pure HTML in, JobRecords out, so
+the same code runs against saved fixtures. rendered_jobs() feeds it the cards a
+live browser page renders, batch by batch.
+"""
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+from executors.health import health
+from executors.metrics import count_cards, span
+from executors.stream import cancelled
+from executors.record import JobRecord
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Count rendered cards in the browser without pulling them over the wire
+COUNT_CARDS = "return document.querySelectorAll(arguments[0]).length"
+
+# outerHTML of cards arguments[1] up to arguments[2], to parse only what is new
+CARD_HTML = """
+return Array.prototype.slice.call(document.querySelectorAll(arguments[0]), arguments[1], arguments[2])
+    .map(function (card) { return card.outerHTML; });
+"""
+
+
+def field(css, attr="text", required=True, default="", many=False, fallback=None):
+    """
+    Selector definition for one job field.
+    attr is "text" or an attribute name; fallback is another field() tried when css misses.
+    """
+    return {"css": css, "attr": attr, "required": required, "default": default,
+            "many": many, "fallback": fallback}
+
+
+# ----------------- PER-SITE SELECTORS -----------------
+# Plain (non-dict) values are copied into every job as-is.
+SITES = {
+    "Naukri": {
+        "card": ".cust-job-tuple",
+        "fields": {
+            "role": field("a.title"),
+            "company": field("a.comp-name"),
+            "location": field("span.locWdth"),
+            "experience": field("span.expwdth"),
+            "description": field("span.job-desc"),
+            "link": field("a.apply-button", "href", fallback=field("a.title", "href")),
+            "deadline": field(".apply-by", required=False, default="Not mentioned"),
+            "source": "Naukri",
+            "skills": field("ul.tags-gt li", many=True, required=False),
+        },
+    },
+    "LinkedIn": {
+        "card": "ul.jobs-search__results-list li",
+        "fields": {
+            "role": field("a.base-card__full-link span.sr-only"),
+            "company": field("h4.base-search-card__subtitle"),
+            "location": field("span.job-search-card__location"),
+            "link": field("a.base-card__full-link", "href"),
+            "source": "LinkedIn",
+            "description": "",
+            "stipend": "",
+        },
+    },
+    "Unstop": {
+        "card": ".opp-card",
+        "fields": {
+            "role": field("h3"),
+            "company": field("h4"),
+            "location": field("span.location", required=False),
+            "link": field("a", "href"),
+            "source": "Unstop",
+            "description": "",
+            "stipend": "",
+        },
+    },
+}
+
+
+class MissingField(Exception):
+    pass
+
+
+def _value(node, spec, base_url):
+    if spec["attr"] == "text":
+        return " ".join(node.get_text(" ").split())
+    value = node.get(spec["attr"]) or ""
+    if spec["attr"] == "href" and value:
+        value = urljoin(base_url, value)
+    return value
+
+
+def _read(card, spec, base_url):
+    if spec["many"]:
+        return [_value(n, spec, base_url) for n in card.select(spec["css"])]
+    node = card.select_one(spec["css"])
+    if node is not None:
+        return _value(node, spec, base_url)
+    if spec["fallback"]:
+        return _read(card, spec["fallback"], base_url)
+    if spec["required"]:
+        raise MissingField(spec["css"])
+    return spec["default"]
+
+
+def parse_card(card, site, base_url=""):
+    job = {}
+    for key, spec in SITES[site]["fields"].items():
+        job[key] = _read(card, spec, base_url) if isinstance(spec, dict) else spec
+    return JobRecord(**job)
+
+
+def extract_cards(html, site, base_url="", limit=None):
+    """
+    Parse every card for `site` out of one HTML snapshot.
+    Cards missing a required field are skipped, like the old per-element loop did.
+    """
+    soup = BeautifulSoup(html, PARSER)
+    jobs = []
+    found = 0
+    for card in soup.select(SITES[site]["card"]):
+        found += 1
+        try:
+            jobs.append(parse_card(card, site, base_url))
+        except MissingField:
+            continue
+        if limit and len(jobs) >= limit:
+            break
+    count_cards(site, found, len(jobs))
+    health.note_cards(site, found, len(jobs))
+    return jobs
+
+
+def extract_fragments(fragments, site, base_url=""):
+    """
+    Parse cards sent over one at a time (the CARD_HTML probe), e.g. only the
+    ones a scroll just rendered.
+    """
+    jobs = []
+    for fragment in fragments:
+        try:
+            jobs.append(parse_card(BeautifulSoup(fragment, PARSER), site, base_url))
+        except MissingField:
+            continue
+    count_cards(site, len(fragments), len(jobs))
+    health.note_cards(site, len(fragments), len(jobs))
+    return jobs
+
+
+# ----------------- RENDERED PAGES -----------------
+def rendered_jobs(driver, site, batches, max_jobs, seen=None, cancel=None):
+    """
+    Parse and yield the cards of each (start, end) batch as it renders (see
+    waits.scroll_batches), fetching only that batch from the browser. Stops
+    after `max_jobs` jobs, once `cancel` is set, or when `seen` has caught up.
+    """
+    css = SITES[site]["card"]
+    base_url = driver.current_url
+    emitted = 0
+    for start, end in batches:
+        with span(site, "extract"):
+            jobs = extract_fragments(driver.execute_script(CARD_HTML, css, start, end), site, base_url)
+        if seen is not None:
+            jobs = seen.select(jobs)
+        for job in jobs:
+            yield job
+            emitted += 1
+            if emitted >= max_jobs:
+                return
+        if cancelled(cancel) or (seen is not None and seen.caught_up):
+            return
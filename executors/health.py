@@ -0,0 +1,194 @@
+# executors/health.py
+"""
+Per-source health: rolling latency and failure rate of recent live searches.
+
+run_sources() consults it before and during every search:
+
+    health.allow("Naukri")        # False while Naukri's circuit is open
+    health.budget("Naukri", 40)   # seconds, tightened to what Naukri usually takes
+    health.hedge_after("Naukri")  # when to start a second attempt, or None
+    health.max_jobs("Naukri", 20, 40)  # fewer jobs from a source that has slowed down
+
+A source that fails (errors, times out with nothing, or renders cards none of
+which parse because its selectors broke) in more than FAILURE_RATE of its last
+HEALTH_WINDOW searches has its circuit opened: it is skipped outright for
+COOL_DOWN seconds instead of making every search wait out its timeouts. After
+the cool-down one search is let through as a trial; success closes the
+circuit, failure opens it again.
+
+State is per process, like the driver pool: each worker learns on its own.
+Card counts are per search attempt: run_sources() runs each attempt inside
+health.run(), and note_cards() adds to the run of whichever attempt parsed
+them, so a concurrent search of the same source can't mark this one broken.
+"""
+from collections import deque
+from contextlib import contextmanager
+import contextvars, math, os, threading, time
+
+HEALTH_WINDOW = int(os.environ.get("HEALTH_WINDOW", 20))    # recent searches remembered per source
+MIN_SAMPLES = 5               # searches needed before any decision is made from the window
+FAILURE_RATE = 0.5            # failure share of the window that opens the circuit
+COOL_DOWN = int(os.environ.get("CIRCUIT_COOL_DOWN", 120))   # seconds a source is skipped once its circuit opens
+BUDGET_HEADROOM = 2.0         # budget = p95 latency x this, never below MIN_BUDGET or above the configured one
+MIN_BUDGET = 8                # seconds
+HEDGE = os.environ.get("SOURCE_HEDGE", "0") == "1"          # second attempt once a source runs past its p95
+MIN_JOBS = 5                  # max_jobs never drops below this
+
+
+_current_run = contextvars.ContextVar("health_run", default=None)
+
+
+class SearchRun:
+    """
+    Card counts of one search attempt, as note_cards() reported them.
+    """
+    def __init__(self):
+        self.batches = []   # (found, parsed) per batch; list.append is safe across page threads
+
+    @property
+    def unparsed(self):
+        """
+        True when the attempt rendered cards and parsed none of them.
+        """
+        return sum(found for found, _ in self.batches) > 0 and not sum(parsed for _, parsed in self.batches)
+
+
+def bound_to_run(fn):
+    """
+    `fn`, reporting its note_cards() calls to the search run current here even
+    when it is called on another thread (e.g. a page-fetching pool).
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+class SourceHealth:
+    def __init__(self, window=HEALTH_WINDOW, failure_rate=FAILURE_RATE, cool_down=COOL_DOWN, hedge=HEDGE):
+        self.window = window
+        self.failure_rate = failure_rate
+        self.cool_down = cool_down
+        self.hedge = hedge
+        self._outcomes = {}   # source -> deque of bools, True for a failure
+        self._latency = {}    # source -> deque of seconds for searches that ran to the end or timed out
+        self._open_until = {}  # source -> monotonic time the circuit may close; absent when closed
+        self._trial = set()   # sources with a half-open trial search in flight
+        self._lock = threading.Lock()
+
+    # ----------------- RECORDING -----------------
+    @contextmanager
+    def run(self):
+        """
+        One search attempt: note_cards() calls made inside it (on this thread,
+        or through bound_to_run()) go to the SearchRun it yields.
+        """
+        run = SearchRun()
+        token = _current_run.set(run)
+        try:
+            yield run
+        finally:
+            _current_run.reset(token)
+
+    def note_cards(self, source, found, parsed):
+        """
+        Called with every batch of cards parsed (next to metrics.count_cards).
+        Cards on the page of which none parse mean the selectors broke.
+        Outside a run() (pre-crawls, cache refreshes) there is nothing to tell.
+        """
+        run = _current_run.get()
+        if run is not None:
+            run.batches.append((found, parsed))
+
+    def record(self, source, state, elapsed, count=0, partial=False, unparsed=False):
+        """
+        Outcome of one search of `source` (a run_sources() status). A search
+        fails when it raised, timed out with nothing, or came back empty because
+        its cards didn't parse (`unparsed`, see SearchRun). A clean search that
+        found nothing succeeds.
+        """
+        with self._lock:
+            failed = state == "failed" or (not count and not partial and (state == "timeout" or unparsed))
+            self._outcomes.setdefault(source, deque(maxlen=self.window)).append(failed)
+            if state in ("done", "timeout") and not partial:
+                self._latency.setdefault(source, deque(maxlen=self.window)).append(elapsed)
+            trial = source in self._trial
+            self._trial.discard(source)
+            outcomes = self._outcomes[source]
+            if trial:
+                if failed:
+                    self._open(source)
+                else:
+                    self._open_until.pop(source, None)
+                    outcomes.clear()  # a fresh start, or the old failures would reopen it at once
+                    outcomes.append(False)
+            elif len(outcomes) >= MIN_SAMPLES and sum(outcomes) / len(outcomes) > self.failure_rate:
+                self._open(source)
+
+    def _open(self, source):
+        if source not in self._open_until:
+            print(f"{source} is failing, skipping it for {self.cool_down}s")
+        self._open_until[source] = time.monotonic() + self.cool_down
+
+    # ----------------- DECISIONS -----------------
+    def allow(self, source):
+        """
+        True when `source` should be searched: its circuit is closed, or the
+        cool-down is over and no other trial search is running.
+        """
+        with self._lock:
+            until = self._open_until.get(source)
+            if until is None:
+                return True
+            if time.monotonic() < until or source in self._trial:
+                return False
+            self._trial.add(source)
+            return True
+
+    def retry_in(self, source):
+        with self._lock:
+            until = self._open_until.get(source)
+        return max(0, round(until - time.monotonic())) if until else 0
+
+    def p95(self, source):
+        with self._lock:
+            latency = list(self._latency.get(source, ()))
+        return _percentile(latency, 95) if len(latency) >= MIN_SAMPLES else None
+
+    def budget(self, source, default):
+        """
+        Seconds to give `source`: BUDGET_HEADROOM x its p95, so one that hangs is
+        cut off long before the configured budget when it is normally quick.
+        """
+        p95 = self.p95(source)
+        if p95 is None:
+            return default
+        return min(default, max(MIN_BUDGET, p95 * BUDGET_HEADROOM))
+
+    def hedge_after(self, source):
+        """
+        Seconds after which a still-empty search of `source` gets a second,
+        hedged attempt; None when hedging is off or there is no history yet.
+        """
+        return self.p95(source) if self.hedge else None
+
+    def max_jobs(self, source, default, budget):
+        """
+        `default`, scaled down when the source's median search takes more than
+        half of `budget`, so a slow source still finishes inside it.
+        """
+        with self._lock:
+            latency = list(self._latency.get(source, ()))
+        if len(latency) < MIN_SAMPLES:
+            return default
+        p50 = _percentile(latency, 50)
+        target = budget / 2
+        if p50 <= target:
+            return default
+        return max(MIN_JOBS, int(default * target / p50))
+
+
+health = SourceHealth()
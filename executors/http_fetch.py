@@ -0,0 +1,240 @@
+# executors/http_fetch.py
+"""
+Browserless fetchers: read each site's public search endpoints over pooled
+HTTP connections and parse the responses directly, with no Chrome involved.
+
+    LinkedIn  guest job search API (server-rendered <li> cards, 10 per page)
+    Naukri    the JSON search API its own frontend calls
+    Unstop    the public opportunity search JSON API
+
+One requests.Session per process keeps connections alive across searches and
+asks for compressed responses. Result pages are fetched concurrently, and
+each stream_*_http() generator yields a page's jobs as soon as it is in.
+with_fallback() runs the matching Selenium executor whenever the lightweight
+path errors or comes back empty (blocked, captcha, changed markup).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import math, os, threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from executors.extract import extract_cards
+from executors.health import health, bound_to_run
+from executors.metrics import span, count_cards
+from executors.record import JobRecord
+from executors.stream import cancelled
+from executors.registry import base_url
+
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 16))   # keep-alive connections per host
+HTTP_TIMEOUT = (5, 15)                                          # connect, read (seconds)
+MAX_PAGES = 5                                                   # result pages per search
+
+try:
+    import brotli  # noqa: F401
+    _ENCODINGS = "gzip, deflate, br"
+except ImportError:
+    _ENCODINGS = "gzip, deflate"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": _ENCODINGS,
+}
+
+_session = None
+_session_lock = threading.Lock()
+_pages = ThreadPoolExecutor(max_workers=8, thread_name_prefix="http-page")
+
+
+class EmptyResult(Exception):
+    pass
+
+
+def session():
+    """
+    Process-wide Session with a pooled, retrying adapter.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET",))
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+            _session = requests.Session()
+            _session.headers.update(HEADERS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+    return _session
+
+
+def _get(url, params, headers=None):
+    response = session().get(url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response
+
+
+def _stream(fetch_page, page_size, max_jobs, seen=None, cancel=None):
+    """
+    Fetch as many pages as `max_jobs` needs, concurrently, then more rounds
+    while pages keep coming back full, yielding each page's jobs as soon as it
+    and the pages before it are in. Duplicate links are dropped.
+
+    With a SeenTracker as `seen` only new postings are kept: the first page is
+    fetched on its own, and no further pages are requested once the tracker
+    has caught up with the postings stored last time.
+    """
+    links, page, emitted = set(), 1, 0
+    while emitted < max_jobs and page <= MAX_PAGES:
+        if cancelled(cancel) or (seen is not None and seen.caught_up):
+            return
+        wanted = min(math.ceil((max_jobs - emitted) / page_size), MAX_PAGES - page + 1)
+        if seen is not None and seen.known and page == 1:
+            wanted = 1  # a query with nothing new costs one request
+        result = []
+        for result in _pages.map(bound_to_run(fetch_page), range(page, page + wanted)):
+            for job in result:
+                if job["link"] in links or (seen is not None and not seen.check(job["link"])):
+                    continue
+                links.add(job["link"])
+                yield job
+                emitted += 1
+                if emitted >= max_jobs:
+                    return
+        page += wanted
+        if not result:
+            return
+
+
+# ----------------- LINKEDIN -----------------
+LINKEDIN_PAGE = 10
+
+
+def stream_linkedin_http(role="", company="", location="", max_jobs=20, seen=None, cancel=None):
+    url = base_url("LinkedIn") + "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    params = {"keywords": " ".join(p for p in (role, company) if p), "location": location or "India",
+              "f_TPR": "r604800"}  # past week, like the browser flow
+
+    def fetch_page(page):
+        html = _get(url, dict(params, start=(page - 1) * LINKEDIN_PAGE)).text
+        # The API returns bare <li> cards; wrap them so the shared selectors apply
+        return extract_cards(f'<ul class="jobs-search__results-list">{html}</ul>', "LinkedIn", url)
+
+    return _stream(fetch_page, LINKEDIN_PAGE, max_jobs, seen, cancel)
+
+
+def search_linkedin_http(role="", company="", location="", max_jobs=20, seen=None):
+    return list(stream_linkedin_http(role, company, location, max_jobs, seen))
+
+
+# ----------------- NAUKRI -----------------
+NAUKRI_PAGE = 20
+NAUKRI_HEADERS = {"appid": "109", "systemid": "109", "Accept": "application/json"}
+
+
+def parse_naukri(data, base_url):
+    items = data.get("jobDetails") or []
+    jobs = []
+    for item in items:
+        labels = {p.get("type"): p.get("label", "") for p in item.get("placeholders") or []}
+        if not item.get("title") or not item.get("jdURL"):
+            continue
+        jobs.append(JobRecord(
+            role=item["title"],
+            company=item.get("companyName", ""),
+            location=labels.get("location", ""),
+            experience=labels.get("experience", ""),
+            description="",
+            link=urljoin(base_url, item["jdURL"]),
+            deadline="Not mentioned",
+            source="Naukri",
+            skills=[s.strip() for s in (item.get("tagsAndSkills") or "").split(",") if s.strip()],
+        ))
+    count_cards("Naukri", len(items), len(jobs))
+    health.note_cards("Naukri", len(items), len(jobs))
+    return jobs
+
+
+def stream_naukri_http(query="", max_jobs=20, seen=None, cancel=None):
+    base = base_url("Naukri")
+    url = base + "/jobapi/v3/search"
+    params = {"noOfResults": NAUKRI_PAGE, "urlType": "search_by_keyword", "searchType": "adv",
+              "keyword": query, "src": "jobsearchDesk"}
+
+    def fetch_page(page):
+        return parse_naukri(_get(url, dict(params, pageNo=page), NAUKRI_HEADERS).json(), base + "/")
+
+    return _stream(fetch_page, NAUKRI_PAGE, max_jobs, seen, cancel)
+
+
+def search_naukri_http(query="", max_jobs=20, seen=None):
+    return list(stream_naukri_http(query, max_jobs, seen))
+
+
+# ----------------- UNSTOP -----------------
+UNSTOP_PAGE = 15
+
+
+def parse_unstop(data, base_url):
+    items = (data.get("data") or {}).get("data") or []
+    jobs = []
+    for item in items:
+        link = item.get("seo_url") or (urljoin(base_url, item["public_url"]) if item.get("public_url") else "")
+        if not item.get("title") or not link:
+            continue
+        locations = (item.get("jobDetail") or {}).get("locations") or []
+        jobs.append(JobRecord(
+            role=item["title"],
+            company=(item.get("organisation") or {}).get("name", ""),
+            location=", ".join(l if isinstance(l, str) else l.get("city", "") for l in locations),
+            link=link,
+            source="Unstop",
+            description="",
+            stipend="",
+        ))
+    count_cards("Unstop", len(items), len(jobs))
+    health.note_cards("Unstop", len(items), len(jobs))
+    return jobs
+
+
+def stream_unstop_http(query="", max_jobs=20, seen=None, cancel=None):
+    base = base_url("Unstop")
+    url = base + "/api/public/opportunity/search-result"
+    params = {"opportunity": "jobs", "per_page": UNSTOP_PAGE, "searchTerm": query}
+
+    def fetch_page(page):
+        return parse_unstop(_get(url, dict(params, page=page)).json(), base + "/")
+
+    return _stream(fetch_page, UNSTOP_PAGE, max_jobs, seen, cancel)
+
+
+def search_unstop_http(query="", max_jobs=20, seen=None):
+    return list(stream_unstop_http(query, max_jobs, seen))
+
+
+# ----------------- FALLBACK -----------------
+def with_fallback(source, fast, slow, seen=None):
+    """
+    Stream jobs from `fast()`, or from `slow()` (the browser executor) when the
+    lightweight fetch fails or finds nothing before yielding a job. On a delta
+    crawl, finding nothing because every posting was already stored (`seen`
+    caught up) is a success.
+    """
+    yielded = 0
+    try:
+        with span(source, "http"):
+            for job in fast():
+                yielded += 1
+                yield job
+        if not yielded and not (seen is not None and seen.caught_up):
+            raise EmptyResult("no jobs")
+        return
+    except Exception as e:
+        if yielded:
+            print(f"{source} HTTP fetch failed after {yielded} jobs ({e}), keeping those")
+            return
+        print(f"{source} HTTP fetch failed ({e}), falling back to the browser")
+    yield from slow()
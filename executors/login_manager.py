@@ -1,24 +1,117 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-import pickle, os, time
+from executors.driver_pool import get_pool
+import json, os, pickle, sys, tempfile, threading, time
 
 # ----------------- COOKIE FILES -----------------
-COOKIE_FILE_NAUKRI = "cookies_naukri.pkl"
-COOKIE_FILE_UNSTOP = "cookies_unstop.pkl"
-COOKIE_FILE_LINKEDIN = "cookies_linkedin.pkl"
+# JSON, one list of cookies (Selenium's get_cookies() shape) per site. Older
+# versions pickled them to cookies_<site>.pkl; `flask migrate-sessions`
+# converts those (see migrate_pickles()).
+COOKIE_FILE_NAUKRI = "cookies_naukri.json"
+COOKIE_FILE_UNSTOP = "cookies_unstop.json"
+COOKIE_FILE_LINKEDIN = "cookies_linkedin.json"
+
+SITES = {
+    "naukri": {"file": COOKIE_FILE_NAUKRI, "login": "https://www.naukri.com/nlogin/login", "auth": "nauk_at"},
+    "unstop": {"file": COOKIE_FILE_UNSTOP, "login": "https://unstop.com/auth/login", "auth": None},
+    "linkedin": {"file": COOKIE_FILE_LINKEDIN, "login": "https://www.linkedin.com/login", "auth": "li_at"},
+}
+EXPIRY_MARGIN = 5 * 60  # treat a session as expired this many seconds early
 
 # ----------------- INIT DRIVER -----------------
 def init_driver(headless=False):
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--start-maximized")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    return driver
+    """
+    Check a browser out of the shared pool. Hand it back with release_driver().
+    Manual logins get a visible, full browser (images on, nothing blocked).
+    """
+    return get_pool(headless, lean=False).checkout()
+
+def release_driver(driver, headless=False):
+    get_pool(headless, lean=False).checkin(driver)
+
+# ----------------- SESSION STORE -----------------
+class SessionStore:
+    """
+    Decoded cookies per site, kept in memory and re-read only when the file
+    on disk changes (another process logged in again).
+    """
+
+    def __init__(self):
+        self._cache = {}   # site -> (file mtime, cookies)
+        self._warned = set()  # sites whose unconverted .pkl session was already reported
+        self._lock = threading.Lock()
+
+    def cookies(self, site):
+        """
+        Unexpired cookies for `site`, or [] when nothing usable is saved. A
+        session pickled by an older version is not read until
+        `flask migrate-sessions` has converted it.
+        """
+        path = SITES[site]["file"]
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            legacy = _legacy_file(site)
+            if os.path.exists(legacy) and site not in self._warned:
+                self._warned.add(site)
+                print(f"Ignoring {legacy}: run `flask migrate-sessions` to convert it to {path}")
+            return []
+        with self._lock:
+            cached = self._cache.get(site)
+            if cached is None or cached[0] != mtime:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        cached = (mtime, json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"Could not read {path}:", e)
+                    return []
+                self._cache[site] = cached
+        now = time.time()
+        return [c for c in cached[1] if not c.get("expiry") or c["expiry"] > now]
+
+    def valid(self, site):
+        """
+        True when the saved session should still be logged in: the site's auth
+        cookie (or, for sites without a known one, any cookie) has not expired.
+        """
+        auth = SITES[site]["auth"]
+        margin = time.time() + EXPIRY_MARGIN
+        for cookie in self.cookies(site):
+            if (auth is None or cookie["name"] == auth) and (not cookie.get("expiry") or cookie["expiry"] > margin):
+                return True
+        return False
+
+    def save(self, site, cookies):
+        path = SITES[site]["file"]
+        # A temp file of its own (created owner-only: session tokens) per save,
+        # so concurrent saves never write into each other's file
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False) as f:
+            try:
+                json.dump(cookies, f, indent=1)
+            except Exception:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path)
+        with self._lock:
+            self._cache.pop(site, None)
+
+sessions = SessionStore()
+
+def _to_cdp(cookie):
+    params = {k: cookie[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly") if k in cookie}
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        params["sameSite"] = cookie["sameSite"]
+    if cookie.get("expiry"):
+        params["expires"] = cookie["expiry"]
+    return params
+
+def _from_cdp(cookie):
+    stored = {k: cookie[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly")}
+    if cookie.get("sameSite"):
+        stored["sameSite"] = cookie["sameSite"]
+    if not cookie.get("session") and cookie.get("expires", -1) > 0:
+        stored["expiry"] = int(cookie["expires"])
+    return stored
 
 # ----------------- LOGIN AND SAVE COOKIES -----------------
 def login_and_save_cookies(site="naukri"):
@@ -26,63 +119,86 @@ def login_and_save_cookies(site="naukri"):
     Opens login page, waits for manual login, then saves cookies.
     Do this only once. After that, cookies are reused.
     """
-    driver = init_driver(headless=False)
-
-    if site == "naukri":
-        url = "https://www.naukri.com/nlogin/login"
-        cookie_file = COOKIE_FILE_NAUKRI
-    elif site == "unstop":
-        url = "https://unstop.com/auth/login"
-        cookie_file = COOKIE_FILE_UNSTOP
-    elif site == "linkedin":
-        url = "https://www.linkedin.com/login"
-        cookie_file = COOKIE_FILE_LINKEDIN
-    else:
+    if site not in SITES:
         print("Unknown site")
         return
+    driver = init_driver(headless=False)
 
-    driver.get(url)
+    driver.get(SITES[site]["login"])
     print(f"Please log in manually to {site.upper()} within 60-90 seconds...")
     time.sleep(90)  # give time to log in manually
 
-    # Save cookies
-    cookies = driver.get_cookies()
-    with open(cookie_file, "wb") as f:
-        pickle.dump(cookies, f)
-    print(f"Saved {site.upper()} cookies in {cookie_file}")
-    driver.quit()
+    # Save cookies from every domain the login touched, not just the current page's
+    try:
+        cookies = [_from_cdp(c) for c in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]]
+    except Exception:
+        cookies = driver.get_cookies()
+    sessions.save(site, cookies)
+    print(f"Saved {site.upper()} cookies in {SITES[site]['file']}")
+    release_driver(driver)
 
 # ----------------- LOAD COOKIES -----------------
+def restore_session(driver, site):
+    """
+    Inject the saved session into a driver through DevTools, before its first
+    navigation, so the caller can go straight to the page it needs. Returns
+    False, without touching the network, when there is no saved session, it
+    has expired or its file can't be read.
+    """
+    try:
+        if site not in SITES or not sessions.valid(site):
+            return False
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_to_cdp(c) for c in sessions.cookies(site)]})
+    except Exception as e:
+        print(f"Could not restore {site.upper()} session:", e)
+        return False
+    return True
+
 def load_cookies(driver, site="naukri"):
     """
-    Load saved cookies into a driver session.
-    """
-    if site == "naukri":
-        cookie_file = COOKIE_FILE_NAUKRI
-        url = "https://www.naukri.com"
-    elif site == "unstop":
-        cookie_file = COOKIE_FILE_UNSTOP
-        url = "https://unstop.com"
-    elif site == "linkedin":
-        cookie_file = COOKIE_FILE_LINKEDIN
-        url = "https://www.linkedin.com"
-    else:
+    Load saved cookies into a driver session (see restore_session()).
+    """
+    if site not in SITES:
         print("Unknown site")
         return False
-
-    if not os.path.exists(cookie_file):
-        print(f"No cookies found for {site.upper()}, please run login_and_save_cookies first.")
+    if not restore_session(driver, site):
+        print(f"No valid {site.upper()} session, please run login_and_save_cookies first.")
         return False
-
-    driver.get(url)  # open domain before adding cookies
-    with open(cookie_file, "rb") as f:
-        cookies = pickle.load(f)
-        for cookie in cookies:
-            driver.add_cookie(cookie)
-    driver.refresh()
     print(f"Loaded {site.upper()} cookies")
     return True
 
+# ----------------- MIGRATION -----------------
+def migrate_pickles():
+    """
+    Convert cookie files pickled by older versions into JSON (`flask
+    migrate-sessions`). Only unpickle files this app wrote itself: unpickling
+    runs arbitrary code. Returns the number of sessions converted.
+    """
+    return sum(_migrate_pickle(site) for site in SITES)
+
+def _legacy_file(site):
+    return SITES[site]["file"].replace(".json", ".pkl")
+
+def _migrate_pickle(site):
+    """
+    Convert `site`'s legacy cookies_<site>.pkl when it has no JSON file yet.
+    Returns True when a session was converted.
+    """
+    path = SITES[site]["file"]
+    legacy = _legacy_file(site)
+    if not os.path.exists(legacy) or os.path.exists(path):
+        return False
+    try:
+        with open(legacy, "rb") as f:
+            cookies = pickle.load(f)
+    except Exception as e:
+        print(f"Could not convert {legacy}:", e)
+        return False
+    sessions.save(site, [dict(c) for c in cookies])
+    print(f"Converted {legacy} to {path}")
+    return True
+
 # ----------------- LOGIN ALL -----------------
 def login_all_sites():
     """
@@ -90,3 +206,10 @@ def login_all_sites():
     """
     for site in ["naukri", "unstop", "linkedin"]:
         login_and_save_cookies(site)
+
+if __name__ == "__main__":
+    # python -m executors.login_manager [login | migrate]
+    if sys.argv[1:] == ["migrate"]:
+        migrate_pickles()
+    else:
+        login_all_sites()
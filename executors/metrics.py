@@ -0,0 +1,116 @@
+# executors/metrics.py
+"""
+Timing spans and counters for scrapes and searches, exposed in Prometheus
+format at /metrics.
+
+    with span("Naukri", "scroll"):
+        ...
+    count_cards("Naukri", found=25, parsed=20)
+
+Set METRICS_ENABLED=0 (or run without prometheus_client installed) and every
+helper turns into a no-op: span() hands back one shared null context and the
+counters return immediately.
+
+Scrapes run in worker processes, not the web process. Point
+PROMETHEUS_MULTIPROC_DIR at a directory shared by the web app and workers
+(emptied before they start) and /metrics reports all of them together.
+"""
+from contextlib import contextmanager, nullcontext
+import os, time
+
+try:
+    import prometheus_client as prom
+    from prometheus_client import multiprocess
+except ImportError:
+    prom = None
+
+ENABLED = prom is not None and os.environ.get("METRICS_ENABLED", "1") != "0"
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Scrape stages run from seconds to a minute; route timings are much shorter
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90)
+ROUTE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+_NULL = nullcontext()
+
+if ENABLED:
+    STAGE_SECONDS = prom.Histogram("jobfinder_stage_seconds", "Time spent in each scrape stage",
+                                   ["source", "stage"], buckets=STAGE_BUCKETS)
+    SOURCE_SECONDS = prom.Histogram("jobfinder_source_seconds", "Time until a source finished, failed or timed out",
+                                    ["source", "state"], buckets=STAGE_BUCKETS)
+    CARDS = prom.Counter("jobfinder_cards", "Job cards found, parsed and dropped (missing a required field)",
+                         ["source", "outcome"])
+    CACHE = prom.Counter("jobfinder_cache_lookups", "Search cache lookups by result", ["source", "result"])
+    HEDGES = prom.Counter("jobfinder_hedges", "Hedged second attempts started, and how many won", ["source", "outcome"])
+    PAGE_BYTES = prom.Counter("jobfinder_page_bytes", "Bytes the browser transferred for result pages", ["source"])
+    PAGE_REQUESTS = prom.Counter("jobfinder_page_requests", "Subresource requests made by result pages", ["source"])
+    PAGE_LOAD_SECONDS = prom.Histogram("jobfinder_page_load_seconds", "Result page load time in the browser",
+                                       ["source"], buckets=STAGE_BUCKETS)
+    ROUTE_SECONDS = prom.Histogram("jobfinder_route_seconds", "Time spent serving a route",
+                                   ["route"], buckets=ROUTE_BUCKETS)
+
+
+# ----------------- RECORDING -----------------
+@contextmanager
+def _timed(histogram, labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(*labels).observe(time.perf_counter() - start)
+
+
+def span(source, stage):
+    """
+    Context manager timing one stage of a scrape (driver, navigate, login, scroll, extract, ...).
+    """
+    return _timed(STAGE_SECONDS, (source, stage)) if ENABLED else _NULL
+
+
+def observe_route(route, seconds):
+    if ENABLED:
+        ROUTE_SECONDS.labels(route).observe(seconds)
+
+
+def observe_source(source, state, seconds):
+    if ENABLED:
+        SOURCE_SECONDS.labels(source, state).observe(seconds)
+
+
+def observe_page(source, size, requests, load_seconds):
+    if ENABLED:
+        PAGE_BYTES.labels(source).inc(size)
+        PAGE_REQUESTS.labels(source).inc(requests)
+        PAGE_LOAD_SECONDS.labels(source).observe(load_seconds)
+
+
+def count_cards(source, found, parsed):
+    if ENABLED:
+        CARDS.labels(source, "found").inc(found)
+        CARDS.labels(source, "parsed").inc(parsed)
+        CARDS.labels(source, "dropped").inc(found - parsed)
+
+
+def count_cache(source, result):
+    if ENABLED:
+        CACHE.labels(source, result).inc()
+
+
+def count_hedge(source, outcome):
+    if ENABLED:
+        HEDGES.labels(source, outcome).inc()
+
+
+# ----------------- EXPOSITION -----------------
+def exposition():
+    """
+    (body, content type) for a /metrics response, or None when metrics are off.
+    """
+    if not ENABLED:
+        return None
+    if MULTIPROC_DIR:
+        registry = prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prom.REGISTRY
+    return prom.generate_latest(registry), prom.CONTENT_TYPE_LATEST
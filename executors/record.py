@@ -0,0 +1,105 @@
+# executors/record.py
+"""
+Compact job record shared by the executors, the search cache and the pre-crawler.
+
+A scraped job used to be a plain dict: a hash table per posting, with the same
+keys every time and the same few values over and over ("LinkedIn", a handful of
+companies and cities, empty descriptions). JobRecord keeps the fields in
+__slots__ and interns the categorical ones, so a million postings share one
+copy of each source, company, location, experience and deadline string.
+
+It still reads like the dict it replaces (job["role"], job.get("skills"),
+dict(job), "deadline" in job), so ranking, dedupe and delta code work on either.
+Missing optional fields are None and are left out of keys(), like keys the old
+dicts simply didn't have. Convert with to_dict() where a real dict is needed
+(templates, JSON) and from_dict() / models.Job.to_record() going the other way.
+"""
+import sys
+
+FIELDS = ("role", "company", "location", "link", "source", "description", "stipend",
+          "experience", "deadline", "skills")
+INTERNED = ("company", "location", "source", "experience", "deadline")
+_FIELD_SET = frozenset(FIELDS)
+ALWAYS = ("role", "company", "location", "link", "source", "description", "stipend")  # present in every to_dict()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class JobRecord:
+    __slots__ = FIELDS
+
+    def __init__(self, role="", company="", location="", link="", source="", description="",
+                 stipend="", experience=None, deadline=None, skills=None):
+        self.role = role
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.link = link
+        self.source = _intern(source)
+        self.description = description
+        self.stipend = stipend
+        self.experience = _intern(experience)
+        self.deadline = _intern(deadline)
+        self.skills = tuple(sys.intern(s) for s in skills) if skills else None
+
+    @classmethod
+    def from_dict(cls, job):
+        """
+        Record for a job dict (or another record). Keys outside FIELDS are dropped.
+        """
+        return cls(**{field: job[field] for field in FIELDS if field in job and job[field] is not None})
+
+    def to_dict(self):
+        """
+        Plain dict in the shape models.Job.to_dict() returns.
+        """
+        job = {field: getattr(self, field) or "" for field in ALWAYS}
+        if self.experience:
+            job["experience"] = self.experience
+        if self.deadline:
+            job["deadline"] = self.deadline
+        if self.skills:
+            job["skills"] = list(self.skills)
+        return job
+
+    # ----------------- DICT INTERFACE -----------------
+    def __getitem__(self, key):
+        value = getattr(self, key, None) if key in _FIELD_SET else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in INTERNED else value)
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in _FIELD_SET else None
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return key in _FIELD_SET and getattr(self, key) is not None
+
+    def keys(self):
+        return [field for field in FIELDS if getattr(self, field) is not None]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, JobRecord):
+            return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"JobRecord({self.source}: {self.role!r} at {self.company!r})"
@@ -0,0 +1,74 @@
+# executors/registry.py
+"""
+Source registry: every job source by name, with its executors named rather
+than imported.
+
+    stream = registry.load("Naukri", "http")   # imports executors.http_fetch now
+    for job in stream(query="python developer", cancel=stop):
+        ...
+
+A browser executor pulls in selenium, webdriver_manager and the WebDriver
+stack, and the HTTP fetchers pull in requests and the card parsers. The web
+app only needs source names, budgets and base URLs, so it imports this module
+alone and pays for none of that. Scraping processes import each executor the
+first time a source actually uses it.
+"""
+import importlib, os, threading
+
+# ----------------- SOURCES -----------------
+# "browser" / "http" / "batch": "module:function" for each way of scraping the source
+SOURCES = {
+    "Naukri": {
+        "base_url": os.environ.get("NAUKRI_BASE_URL", "https://www.naukri.com"),  # overridden by the benchmark fixtures
+        "budget": 40,   # seconds
+        "browser": "executors.naukri_executor:stream_naukri_jobs",
+        "http": "executors.http_fetch:stream_naukri_http",
+        "batch": "executors.batch:search_naukri_batch",
+    },
+    "LinkedIn": {
+        "base_url": os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com"),
+        "budget": 45,
+        "browser": "executors.linkedin_executor:stream_linkedin_jobs",
+        "http": "executors.http_fetch:stream_linkedin_http",
+        "batch": "executors.batch:search_linkedin_batch",
+    },
+    "Unstop": {
+        "base_url": os.environ.get("UNSTOP_BASE_URL", "https://unstop.com"),
+        "budget": 40,
+        "browser": "executors.unstop_executor:stream_unstop_jobs",
+        "http": "executors.http_fetch:stream_unstop_http",
+        "batch": "executors.batch:search_unstop_batch",
+    },
+}
+
+SEARCH_DEADLINE = 50  # seconds; a live search never waits longer than this
+SOURCE_BUDGETS = {name: spec["budget"] for name, spec in SOURCES.items()}
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def names():
+    return list(SOURCES)
+
+
+def base_url(name):
+    return SOURCES[name]["base_url"]
+
+
+def resolve(target):
+    """
+    The object a "module:attribute" path names, importing the module on first use.
+    """
+    with _lock:
+        if target not in _loaded:
+            module, _, attr = target.partition(":")
+            _loaded[target] = getattr(importlib.import_module(module), attr)
+        return _loaded[target]
+
+
+def load(name, kind="browser"):
+    """
+    Source `name`'s "browser", "http" or "batch" entry point.
+    """
+    return resolve(SOURCES[name][kind])
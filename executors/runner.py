@@ -0,0 +1,185 @@
+# executors/runner.py
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import threading, time
+
+from executors.health import health as source_health
+from executors.metrics import observe_source, count_hedge
+from executors.registry import SEARCH_DEADLINE, SOURCE_BUDGETS  # default budgets (seconds)
+from executors.stream import drain
+
+PROGRESS_INTERVAL = 0.5  # seconds between on_progress calls per source
+
+# Shared pool so a slow source never blocks the next request from starting.
+# Threads (not processes) because the work is I/O bound on the browser.
+_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="source")
+
+
+def run_sources(streams, deadline=SEARCH_DEADLINE, budgets=None, on_result=None, on_progress=None, enough=None,
+                health=source_health):
+    """
+    Run every source stream concurrently and collect whatever arrives in time.
+
+    `streams` maps a source name to a callable taking a threading.Event and
+    returning an iterable of jobs (see executors/stream.py); the event is set to
+    ask the source to stop. Each source is bounded by its own budget and by the
+    overall `deadline`. A source still running when its budget expires is
+    cancelled and reported as "timeout" with the jobs it yielded so far.
+
+    `health` (see executors/health.py) learns from every result. A source whose
+    circuit is open is not run at all and is reported as "skipped"; budgets
+    shrink to what each source usually takes; and, with hedging on, a source
+    that is still empty past its p95 gets a second attempt. The first attempt
+    to yield a job keeps the source and the other is cancelled.
+
+    `enough(job)` is called with every job as it arrives; once it returns True
+    all remaining sources are cancelled and reported as "done" with what they
+    had, marked "partial". `on_progress(name, jobs, status)` gets the jobs so far
+    while a source runs (at most every PROGRESS_INTERVAL), and
+    `on_result(name, jobs, status)` is called once as each source finishes,
+    fails, times out, is stopped or is skipped.
+
+    Returns (jobs, status) where status maps each source to
+    {"state": "done" | "timeout" | "failed" | "skipped", "count": int, "elapsed": float, "error": str}.
+    """
+    budgets = budgets or SOURCE_BUDGETS
+    start = time.monotonic()
+    end = start + deadline
+
+    lock = threading.Lock()
+    cancels = {name: [] for name in streams}   # one Event per attempt
+    collected = {name: [] for name in streams}
+    owner = {}          # source -> the attempt whose jobs are kept: the first one to yield
+    runs = {name: [] for name in streams}      # health.SearchRun per attempt
+    finished = set()
+    filled = Future()   # resolved when `enough` is satisfied, to wake the loop below
+
+    def pull(name, stream, attempt, cancel):
+        with health.run() as run:  # this attempt's card counts
+            runs[name].append(run)
+            last_progress = time.monotonic()
+            for job in drain(stream(cancel), cancel):
+                with lock:  # held while reporting progress, so it can never land after on_result
+                    if name in finished:
+                        break
+                    if name not in owner:
+                        owner[name] = attempt
+                        for i, other in enumerate(cancels[name]):
+                            if i != attempt:
+                                other.set()  # the other attempt lost the race
+                    elif owner[name] != attempt:
+                        break
+                    collected[name].append(job)
+                    if enough is not None and not filled.done() and enough(job):
+                        filled.set_result(True)
+                        for events in cancels.values():
+                            for event in events:
+                                event.set()
+                    if on_progress and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                        last_progress = time.monotonic()
+                        on_progress(name, list(collected[name]),
+                                    {"state": "running", "count": len(collected[name]),
+                                     "elapsed": round(last_progress - start, 2), "error": ""})
+
+    jobs = []
+    status = {}
+    futures = {}    # future -> (source, attempt)
+    expires = {}    # source -> when its budget runs out
+    hedge_at = {}   # source -> when to start its hedged attempt
+
+    def finish(name, state, error="", **extra):
+        with lock:
+            if name in finished:
+                return
+            finished.add(name)
+            result = list(collected[name])
+            hedged = owner.get(name, 0) > 0
+            for event in cancels[name]:
+                event.set()
+        hedge_at.pop(name, None)
+        elapsed = round(time.monotonic() - start, 2)
+        status[name] = dict({"state": state, "count": len(result), "elapsed": elapsed, "error": error}, **extra)
+        jobs.extend(result)
+        observe_source(name, state, elapsed)
+        if state != "skipped":
+            health.record(name, state, elapsed, len(result), extra.get("partial", False),
+                          unparsed=any(run.unparsed for run in runs[name]))
+        if hedged:
+            count_hedge(name, "won")
+        if on_result:
+            on_result(name, result, status[name])
+
+    def launch(name):
+        cancel = threading.Event()
+        with lock:
+            attempt = len(cancels[name])
+            cancels[name].append(cancel)
+        fut = _pool.submit(pull, name, streams[name], attempt, cancel)
+        futures[fut] = (name, attempt)
+        return fut
+
+    for name in streams:
+        if not health.allow(name):
+            finish(name, "skipped", f"failing, retried in {health.retry_in(name)}s")
+            continue
+        budget = health.budget(name, budgets.get(name, deadline))
+        expires[name] = min(end, start + budget)
+        after = health.hedge_after(name)
+        if after is not None and start + after < expires[name]:
+            hedge_at[name] = start + after
+        launch(name)
+
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+
+        # Stop sources whose budget has run out, keeping what they yielded
+        for name in [n for n, at in expires.items() if at <= now and n not in finished]:
+            for fut, (source, _) in futures.items():
+                if source == name:
+                    fut.cancel()  # only helps if it never started
+            finish(name, "timeout")
+
+        # Still nothing past the usual p95: race a second attempt against the first
+        for name in [n for n, at in hedge_at.items() if at <= now]:
+            del hedge_at[name]
+            with lock:
+                empty = name not in owner and name not in finished
+            if empty:
+                count_hedge(name, "started")
+                pending.add(launch(name))
+
+        # The top results are already in: stop everything still running
+        if filled.done():
+            for name in streams:
+                finish(name, "done", partial=True)
+            break
+        pending = {f for f in pending if futures[f][0] not in finished}
+        if not pending:
+            break
+
+        wakeups = [at for n, at in expires.items() if n not in finished] + list(hedge_at.values())
+        done, _ = wait(pending | {filled}, timeout=max(min(wakeups) - now, 0), return_when=FIRST_COMPLETED)
+
+        for fut in done - {filled}:
+            pending.discard(fut)
+            name, attempt = futures[fut]
+            if name in finished:
+                continue
+            with lock:
+                won = owner.get(name)
+            racing = any(futures[f][0] == name for f in pending)
+            if won is not None and won != attempt:
+                continue  # the losing attempt of a hedged pair winding down
+            try:
+                fut.result()
+            except Exception as e:
+                print(f"Error fetching {name} jobs:", e)
+                if won is None and racing:
+                    continue  # the other attempt may still come through
+                finish(name, "failed", str(e))
+                continue
+            if won is None and racing:
+                continue  # came back empty; wait for the other attempt
+            finish(name, "done", **({"partial": True} if filled.done() else {}))
+
+    return jobs, {name: status[name] for name in streams}
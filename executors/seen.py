@@ -0,0 +1,62 @@
+# executors/seen.py
+"""
+Tracks which postings a crawl has already handled, so a repeat crawl of the
+same query can stop once it catches up with what we stored last time.
+
+Postings are identified by their link (normalized by `key`), never by their
+position on the page, so a card that fails to parse or moves between scrolls
+does not throw the count off.
+"""
+import os
+
+KNOWN_RUN = int(os.environ.get("DELTA_KNOWN_RUN", 5))  # known postings in a row that end a delta crawl
+
+
+class SeenTracker:
+    """
+    known:     link keys stored for this (query, source) by earlier crawls
+    watermark: key of the top posting last time; reaching it means we are caught up
+    """
+
+    def __init__(self, known=(), watermark=None, key=None, run=KNOWN_RUN):
+        self.known = set(known)
+        self.watermark = watermark
+        self.key = key or (lambda link: link)
+        self.run = run
+        self.verdicts = {}      # key -> True when new, for every posting processed so far
+        self.new = 0
+        self.caught_up = False
+        self._streak = 0
+
+    def check(self, link):
+        """
+        True when `link` is a posting we have not stored yet. Each posting is
+        counted once, however many times it is checked.
+        """
+        key = self.key(link)
+        if not key:
+            return False
+        if key in self.verdicts:
+            return self.verdicts[key]
+        is_new = key not in self.known and key != self.watermark
+        self.verdicts[key] = is_new
+        if is_new:
+            self.new += 1
+            self._streak = 0
+        else:
+            self._streak += 1
+            if key == self.watermark or self._streak >= self.run:
+                self.caught_up = True
+        return is_new
+
+    def scan(self, links):
+        for link in links:
+            self.check(link)
+        return self.caught_up
+
+    def select(self, jobs, limit=None):
+        """
+        The new postings among `jobs`, in page order.
+        """
+        fresh = [job for job in jobs if self.check(job.get("link"))]
+        return fresh[:limit] if limit else fresh
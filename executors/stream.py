@@ -0,0 +1,38 @@
+# executors/stream.py
+"""
+Streaming executor interface.
+
+Every source is a generator function, stream_<source>(..., cancel=None), that
+yields job dicts as soon as they are extracted instead of returning one list
+at the end:
+
+    for job in stream_naukri_jobs("python developer", cancel=stop):
+        ...
+
+Cancellation is cooperative. Sources check `cancel` (a threading.Event)
+between steps and return early once it is set. Closing the generator stops a
+source too, and in both cases it hands its browser back to the pool on the way
+out. The list-returning search_<source>() functions are thin wrappers that
+drain the stream. Parsing lives in executors/extract.py, so the runner can
+import this module without pulling in BeautifulSoup.
+"""
+
+
+def cancelled(cancel):
+    return cancel is not None and cancel.is_set()
+
+
+def drain(jobs, cancel=None):
+    """
+    Yield from the `jobs` stream until it ends or `cancel` is set, then close it.
+    """
+    try:
+        for job in jobs:
+            yield job
+            if cancelled(cancel):
+                break
+    finally:
+        close = getattr(jobs, "close", None)
+        if close is not None:
+            close()
+
@@ -1,87 +1,91 @@
 # executors/unstop_executor.py
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+from executors.driver_pool import get_pool
+from executors.login_manager import restore_session
+from executors.extract import COUNT_CARDS, SITES, rendered_jobs
+from executors.waits import WaitStats, wait_for_any, wait_for_network_idle
+from executors.stream import cancelled
+from executors.metrics import span
+from executors.registry import base_url
 
-def search_unstop_jobs(query="", max_jobs=20, headless=False,
-                       username="", password=""):
+CARD = SITES["Unstop"]["card"]
+BASE_URL = base_url("Unstop")
+
+
+def stream_unstop_jobs(query="", max_jobs=20, headless=True,
+                       username="", password="", seen=None, cancel=None):
     """
     Search Unstop jobs by query (skip dropdown), login only if required.
+    A session saved by login_manager is restored first, so no login is needed.
+    Yields job dicts; see executors/stream.py.
     """
 
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--start-maximized")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    pool = get_pool(headless)
+    with span("Unstop", "driver"):
+        driver = pool.checkout()
     wait = WebDriverWait(driver, 20)
+    stats = WaitStats("Unstop")
 
-    jobs = []
     try:
-        # --- Step 1: Go to opportunities page ---
-        driver.get("https://unstop.com/opportunities")
-
-        # --- Step 2: Enter search query and press Enter ---
-        search_box = wait.until(EC.element_to_be_clickable(
-            (By.CSS_SELECTOR, "input[placeholder='Search Opportunities'].rounded")
-        ))
-        search_box.clear()
-        search_box.send_keys(query)
-        search_box.send_keys(Keys.RETURN)  # trigger search directly
-        time.sleep(3)  # wait for results or login page
+        with span("Unstop", "navigate"):
+            # --- Step 1: Restore the saved session, then go to opportunities page ---
+            restore_session(driver, "unstop")  # cookies go in before the first page load
+            driver.get(BASE_URL + "/opportunities")
 
-        # --- Step 3: Login if prompted ---
-        try:
-            email_box = driver.find_element(By.ID, "email")
-            pwd_box = driver.find_element(By.ID, "pwd")
+        with span("Unstop", "search"):
+            # --- Step 2: Enter search query and press Enter ---
+            search_box = wait.until(EC.element_to_be_clickable(
+                (By.CSS_SELECTOR, "input[placeholder='Search Opportunities'].rounded")
+            ))
+            search_box.clear()
+            search_box.send_keys(query)
+            search_box.send_keys(Keys.RETURN)  # trigger search directly
+            with stats.step(legacy=3):  # wait for results or login page
+                wait_for_network_idle(driver)
+                wait_for_any(driver, [CARD, "#email"])
 
-            email_box.clear()
-            email_box.send_keys(username)
-            pwd_box.clear()
-            pwd_box.send_keys(password)
-
-            login_btn = driver.find_element(By.XPATH, "//button[contains(@class,'submit_btn')]")
-            driver.execute_script("arguments[0].click();", login_btn)
-            time.sleep(3)  # wait after login
-        except:
-            pass  # login not needed
-
-        # --- Step 4: Collect job cards ---
-        cards = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".opp-card")))[:max_jobs]
+        if cancelled(cancel):
+            return
 
-        for card in cards:
+        with span("Unstop", "login"):
+            # --- Step 3: Login if prompted ---
             try:
-                title = card.find_element(By.CSS_SELECTOR, "h3").text
-                company = card.find_element(By.CSS_SELECTOR, "h4").text
-                loc_elem = card.find_elements(By.CSS_SELECTOR, "span.location")
-                loc = loc_elem[0].text if loc_elem else ""
-                link = card.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
+                email_box = driver.find_element(By.ID, "email")
+                pwd_box = driver.find_element(By.ID, "pwd")
 
-                jobs.append({
-                    "role": title,
-                    "company": company,
-                    "location": loc,
-                    "link": link,
-                    "source": "Unstop",
-                    "description": "",
-                    "stipend": ""
-                })
+                email_box.clear()
+                email_box.send_keys(username)
+                pwd_box.clear()
+                pwd_box.send_keys(password)
+
+                login_btn = driver.find_element(By.XPATH, "//button[contains(@class,'submit_btn')]")
+                driver.execute_script("arguments[0].click();", login_btn)
+                with stats.step(legacy=3):  # wait after login
+                    wait_for_network_idle(driver)
             except:
-                continue
+                pass  # login not needed
+
+        # --- Step 4: Collect job cards ---
+        with stats.step():
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, CARD)))
+        batches = [(0, driver.execute_script(COUNT_CARDS, CARD))]
+        yield from rendered_jobs(driver, "Unstop", batches, max_jobs, seen, cancel)
 
     except Exception as e:
         print("Unstop fetch error:", e)
 
     finally:
-        driver.quit()
+        stats.page(driver)
+        pool.checkin(driver)
+        stats.report()
 
-    return jobs
+
+def search_unstop_jobs(query="", max_jobs=20, headless=True,
+                       username="", password="", seen=None):
+    """
+    All jobs from stream_unstop_jobs() as one list.
+    """
+    return list(stream_unstop_jobs(query, max_jobs, headless, username, password, seen))
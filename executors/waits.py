@@ -0,0 +1,173 @@
+# executors/waits.py
+"""
+Wait on DOM conditions instead of fixed time.sleep() calls.
+
+Every helper returns as soon as its condition holds (or its timeout passes) and can
+record how long it actually waited against the fixed sleep it replaced, so each
+source can report how much idle time was removed.
+"""
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from contextlib import contextmanager, nullcontext
+from executors.extract import COUNT_CARDS
+from executors.metrics import observe_page, span
+import time
+
+POLL = 0.1
+
+# Last WaitStats summary per source, for reporting
+LAST_STATS = {}
+
+
+# ----------------- TIMING STATS -----------------
+class WaitStats:
+    def __init__(self, source):
+        self.source = source
+        self.waited = 0.0   # seconds actually spent waiting
+        self.legacy = 0.0   # seconds the old fixed sleeps would have taken
+        self.steps = 0
+        self.weight = None  # (bytes, requests, load seconds) of the last page, see page()
+
+    @contextmanager
+    def step(self, legacy=0):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.waited += time.monotonic() - start
+            self.legacy += legacy
+            self.steps += 1
+
+    def page(self, driver):
+        """
+        Record what the current page cost to load. Call before the driver goes back to the pool.
+        """
+        try:
+            self.weight = tuple(driver.execute_script(_PAGE_WEIGHT))
+        except Exception:
+            self.weight = None
+
+    def summary(self):
+        summary = {
+            "steps": self.steps,
+            "waited": round(self.waited, 2),
+            "legacy": round(self.legacy, 2),
+            "saved": round(self.legacy - self.waited, 2),
+        }
+        if self.weight:
+            size, requests, load = self.weight
+            summary.update(page_kb=round(size / 1024, 1), page_requests=requests, page_load=round(load, 2))
+        return summary
+
+    def report(self):
+        summary = self.summary()
+        LAST_STATS[self.source] = summary
+        print(f"{self.source} waits: {summary['waited']}s over {summary['steps']} steps "
+              f"(fixed sleeps: {summary['legacy']}s, saved {summary['saved']}s)")
+        if self.weight:
+            observe_page(self.source, *self.weight)
+            print(f"{self.source} page: {summary['page_kb']} KB over {summary['page_requests']} requests, "
+                  f"loaded in {summary['page_load']}s")
+        return summary
+
+
+# ----------------- JS PROBES -----------------
+# Installs a MutationObserver on first call (and again after every navigation),
+# then reports load state, resource count and mutation count in one round-trip.
+_NETWORK_STATE = """
+if (!window.__jfObserver && document.documentElement) {
+    window.__jfMutations = 0;
+    window.__jfObserver = new MutationObserver(function (m) { window.__jfMutations += m.length; });
+    window.__jfObserver.observe(document.documentElement, {childList: true, subtree: true});
+}
+return [document.readyState,
+        performance.getEntriesByType('resource').length,
+        window.__jfMutations || 0];
+"""
+
+# Bytes transferred (document plus subresources), subresource count and load
+# time of the current document, from the Navigation and Resource Timing APIs.
+# Requests the lean profile blocked never appear here.
+_PAGE_WEIGHT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+for (var i = 0; i < resources.length; i++) bytes += resources[i].transferSize || 0;
+var loaded = nav.loadEventEnd || nav.domContentLoadedEventEnd || 0;
+return [bytes, resources.length, loaded / 1000];
+"""
+
+
+def _until(driver, condition, timeout):
+    """
+    Poll `condition(driver)` until truthy; returns its value, or None on timeout.
+    """
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL).until(condition)
+    except TimeoutException:
+        return None
+
+
+# ----------------- WAITS -----------------
+def wait_for_ready(driver, timeout=10):
+    return _until(driver, lambda d: d.execute_script("return document.readyState") == "complete", timeout)
+
+
+def wait_for_any(driver, selectors, timeout=10):
+    """
+    Wait until any of the CSS selectors matches; returns the selector that matched.
+    """
+    def found(d):
+        for css in selectors:
+            if d.execute_script(COUNT_CARDS, css):
+                return css
+        return False
+    return _until(driver, found, timeout)
+
+
+def wait_for_count_increase(driver, css, previous, timeout=5):
+    """
+    Wait until more than `previous` elements match `css`; returns the new count or None.
+    """
+    def grown(d):
+        count = d.execute_script(COUNT_CARDS, css)
+        return count if count > previous else False
+    return _until(driver, grown, timeout)
+
+
+def wait_for_network_idle(driver, idle=0.5, timeout=10):
+    """
+    Wait until the document is loaded and no new resources or DOM mutations
+    have appeared for `idle` seconds. Survives navigations triggered by the caller.
+    """
+    state = {"last": None, "since": time.monotonic()}
+
+    def quiet(d):
+        snapshot = tuple(d.execute_script(_NETWORK_STATE))
+        now = time.monotonic()
+        if snapshot != state["last"]:
+            state["last"], state["since"] = snapshot, now
+            return False
+        return snapshot[0] == "complete" and now - state["since"] >= idle
+    return _until(driver, quiet, timeout)
+
+
+def scroll_batches(driver, css, max_scrolls=15, timeout=3, stats=None, legacy_pause=0):
+    """
+    Yield (start, end) index ranges of the cards matching `css` as they render:
+    first the ones already on the page, then each batch a scroll to the bottom
+    loads. Ends when the list stops growing or after `max_scrolls` scrolls; the
+    caller stops earlier simply by not asking for the next batch.
+    """
+    count = driver.execute_script(COUNT_CARDS, css)
+    if count:
+        yield 0, count
+    for _ in range(max_scrolls):
+        with span(stats.source, "scroll") if stats else nullcontext():
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            with stats.step(legacy=legacy_pause) if stats else nullcontext():
+                grown = wait_for_count_increase(driver, css, count, timeout)
+        if grown is None:
+            return  # no more content
+        yield count, grown
+        count = grown
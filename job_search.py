@@ -0,0 +1,163 @@
+# job_search.py
+"""
+Full-text search over stored jobs with SQLite FTS5.
+
+jobs_fts is an external-content FTS5 table over the jobs table: it stores
+only the index and reads column values back from jobs. Triggers keep it in
+sync on every insert, update and delete, so nothing else has to remember to
+update it.
+
+Query syntax accepted by search_jobs():
+    data scien*            every term must match; a trailing * matches a prefix
+    "machine learning"     quoted words must appear together as a phrase
+Results are ordered by FTS5's bm25() with per-column weights.
+"""
+from datetime import datetime, timedelta
+import re
+
+from sqlalchemy import or_, text
+from models import db, Job
+from dedupe import merge_jobs
+
+# Columns in index order, with their bm25() weights
+FTS_COLUMNS = {"role": 3.0, "company": 2.0, "location": 1.0, "skills": 1.5, "description": 0.5}
+MAX_RESULTS = 200
+
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+")
+
+_COLS = ", ".join(FTS_COLUMNS)
+_NEW = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_OLD = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+_SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5({_COLS}, content='jobs', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN "
+    f"INSERT INTO jobs_fts (rowid, {_COLS}) VALUES (new.id, {_NEW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN "
+    f"INSERT INTO jobs_fts (jobs_fts, rowid, {_COLS}) VALUES ('delete', old.id, {_OLD}); END",
+    f"CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN "
+    f"INSERT INTO jobs_fts (jobs_fts, rowid, {_COLS}) VALUES ('delete', old.id, {_OLD}); "
+    f"INSERT INTO jobs_fts (rowid, {_COLS}) VALUES (new.id, {_NEW}); END",
+]
+
+
+# ----------------- SCHEMA -----------------
+def ensure_index():
+    """
+    Create jobs_fts and its triggers if missing, indexing existing rows once.
+    Safe to run repeatedly.
+    """
+    with db.engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")).first()
+        for statement in _SCHEMA:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')"))
+
+
+def rebuild_index():
+    with db.engine.begin() as conn:
+        conn.execute(text("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')"))
+
+
+# ----------------- QUERIES -----------------
+def _quote(word):
+    return '"' + word.replace('"', '""') + '"'
+
+
+def match_expression(query, columns=None):
+    """
+    Translate user input into an FTS5 MATCH expression, e.g.
+    'data "machine learning" eng*' -> '"data" "machine learning" "eng"*'.
+    Every word is quoted, so FTS5 operators and punctuation in the input are
+    treated as text. Returns "" when there is nothing to search for.
+    """
+    parts = []
+    for phrase, word in _QUERY_PART.findall(query or ""):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                parts.append(_quote(" ".join(words)))
+            continue
+        prefix = word.endswith("*")
+        words = _WORD.findall(word)
+        if not words:
+            continue
+        parts.extend(_quote(w) for w in words[:-1])
+        parts.append(_quote(words[-1]) + ("*" if prefix else ""))
+    if not parts:
+        return ""
+    expr = " ".join(parts)
+    if columns:
+        expr = "{%s} : (%s)" % (" ".join(columns), expr)
+    return expr
+
+
+def search_jobs(query="", sources=None, limit=50, offset=0, since=None, match=None):
+    """
+    Stored jobs matching `query` (see the module docstring), best first, as
+    dicts with an added "score". Stored duplicates come back once, merged as
+    dedupe.merge_jobs() does for live results. `sources` restricts to those
+    sites, `since` to jobs last scraped (first stored or seen again) after
+    that datetime. `match` takes a ready-made MATCH expression instead of
+    `query`.
+    """
+    match = match if match is not None else match_expression(query)
+    if not match:
+        return []
+
+    weights = ", ".join(str(w) for w in FTS_COLUMNS.values())
+    # Rows dedupe_stored_jobs() grouped together rank as one, by their best-scoring copy.
+    # MATERIALIZED keeps SQLite from flattening the CTE, which bm25() can't run in.
+    sql = ("WITH hits AS MATERIALIZED (SELECT coalesce(jobs.canonical_id, jobs.id) AS gid, "
+           "bm25(jobs_fts, %s) AS score FROM jobs_fts "
+           "JOIN jobs ON jobs.id = jobs_fts.rowid WHERE jobs_fts MATCH :match" % weights)
+    params = {"match": match, "limit": min(limit, MAX_RESULTS), "offset": offset}
+    if sources:
+        names = [f":source{n}" for n in range(len(sources))]
+        sql += " AND jobs.source IN (%s)" % ", ".join(names)
+        params.update({name[1:]: source for name, source in zip(names, sources)})
+    if since is not None:
+        sql += " AND jobs.last_seen_at >= :since"
+        params["since"] = since
+    sql += ") SELECT gid, min(score) AS best FROM hits GROUP BY gid ORDER BY best LIMIT :limit OFFSET :offset"
+
+    try:
+        hits = db.session.execute(text(sql), params).all()
+    except Exception as e:
+        db.session.rollback()
+        print("Job search error:", e)
+        return []
+
+    gids = [gid for gid, _ in hits]
+    groups = {}
+    for row in Job.query.filter(or_(Job.id.in_(gids), Job.canonical_id.in_(gids))).order_by(Job.id):
+        groups.setdefault(row.canonical_id or row.id, []).append(row.to_dict())
+    jobs = []
+    for gid, score in hits:
+        if gid in groups:
+            members = groups[gid]
+            job = members[0] if len(members) == 1 else merge_jobs(members)
+            job["score"] = -score  # bm25() is lower-is-better
+            jobs.append(job)
+    return jobs
+
+
+def stored_matches(role="", company="", location="", max_age_days=None, limit=50):
+    """
+    Stored jobs for a dashboard search: role words must match the title or
+    skills, company and location words their own columns; the last word of
+    each part also matches as a prefix. `max_age_days` drops postings no
+    scrape has returned for that long, however long ago they were first stored.
+    """
+    clauses = []
+    for value, columns in ((role, ["role", "skills"]), (company, ["company"]), (location, ["location"])):
+        words = _WORD.findall(value or "")
+        if words:
+            clauses.append(match_expression(" ".join(words) + "*", columns))
+    if not clauses:
+        return []
+    since = datetime.utcnow() - timedelta(days=max_age_days) if max_age_days else None
+    return search_jobs(match=" AND ".join(clauses), limit=limit, since=since)
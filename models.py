@@ -1,9 +1,63 @@
 # models.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateTable
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import json, re
+
+from executors.record import JobRecord
+
+# Query parameters that only track where a click came from; two links that
+# differ only in these point at the same posting
+_TRACKING_PARAM = re.compile(r"^(utm_\w+|refid|trackingid|trk\w*|src|sid|xp|px|position|pagenum|ref|lipi)$", re.I)
 
 db = SQLAlchemy()
 
+def normalize_link(link):
+    """
+    Identity of a posting URL: scheme and host lowercased, tracking parameters,
+    fragment and trailing slash dropped. None when there is no link.
+    """
+    link = (link or "").strip()
+    if not link:
+        return None
+    parts = urlsplit(link)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _TRACKING_PARAM.match(k)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+POSTING_PREFIX = "posting:"  # link_key of postings scraped without a link
+
+def posting_key(job):
+    """
+    Identity of a stored posting: its normalized link or, for postings scraped
+    without one, POSTING_PREFIX + its normalized source, company, role and location.
+    """
+    key = normalize_link(job.get("link"))
+    if key:
+        return key
+    return POSTING_PREFIX + "|".join(" ".join((job.get(field) or "").lower().split())
+                                     for field in ("source", "company", "role", "location"))
+
+def job_values(job):
+    """
+    Column values for a scraped job dict.
+    """
+    return {
+        "company": job.get("company", ""),
+        "role": job.get("role", ""),
+        "description": job.get("description", ""),
+        "stipend": job.get("stipend", ""),
+        "location": job.get("location", ""),
+        "link": job.get("link", ""),
+        "link_key": posting_key(job),
+        "source": job.get("source", ""),
+        "experience": job.get("experience"),
+        "deadline": job.get("deadline"),
+        "skills": json.dumps(job["skills"]) if job.get("skills") else None,
+    }
+
 # User table
 class User(db.Model):
     __tablename__ = "users"
@@ -23,23 +77,216 @@ class Job(db.Model):
     stipend = db.Column(db.String(100))
     location = db.Column(db.String(200))
     link = db.Column(db.String(500))
+    link_key = db.Column(db.String(500))  # posting_key(): normalized link, unique
     source = db.Column(db.String(50))  # LinkedIn / Naukri / Unstop
+    experience = db.Column(db.String(100))
+    deadline = db.Column(db.String(100))
+    skills = db.Column(db.Text)  # JSON list
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow)  # last scrape that returned it
+    # Oldest stored copy of the same posting from another source (dedupe.dedupe_stored_jobs());
+    # NULL on the copy that represents the group in search and alerts
+    canonical_id = db.Column(db.Integer, db.ForeignKey("jobs.id", ondelete="SET NULL"))
+    __table_args__ = (
+        db.Index("ux_jobs_link_key", "link_key", unique=True),
+        db.Index("ix_jobs_last_seen", "last_seen_at"),
+        db.Index("ix_jobs_source_seen", "source", "last_seen_at"),
+        db.Index("ix_jobs_canonical", "canonical_id"),
+        # ids are never reused: alerts take any id past their watermark for a new posting
+        {"sqlite_autoincrement": True},
+    )
+
+    def to_record(self):
+        return JobRecord(
+            role=self.role, company=self.company, location=self.location or "", link=self.link or "",
+            source=self.source or "", description=self.description or "", stipend=self.stipend or "",
+            experience=self.experience or None, deadline=self.deadline or None,
+            skills=json.loads(self.skills) if self.skills else None,
+        )
+
+    def to_dict(self):
+        job = {
+            "role": self.role,
+            "company": self.company,
+            "location": self.location or "",
+            "link": self.link or "",
+            "source": self.source or "",
+            "description": self.description or "",
+            "stipend": self.stipend or "",
+        }
+        if self.experience:
+            job["experience"] = self.experience
+        if self.deadline:
+            job["deadline"] = self.deadline
+        if self.skills:
+            job["skills"] = json.loads(self.skills)
+        return job
+
+    def update_from(self, job):
+        for column, value in job_values(job).items():
+            setattr(self, column, value)
+        return self
+
+# Search cache entries: which jobs a (query, source) scrape returned and when
+cache_entry_jobs = db.Table(
+    "cache_entry_jobs",
+    db.Column("entry_id", db.Integer, db.ForeignKey("search_cache.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("job_id", db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("position", db.Integer, nullable=False),
+)
+
+class SearchCacheEntry(db.Model):
+    __tablename__ = "search_cache"
+    id = db.Column(db.Integer, primary_key=True)
+    query_key = db.Column(db.String(600), nullable=False)
+    source = db.Column(db.String(50), nullable=False)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    __table_args__ = (db.UniqueConstraint("query_key", "source"),)
+
+# Every search users run; the pre-crawler learns popular queries from it
+class SearchHistory(db.Model):
+    __tablename__ = "search_history"
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    role = db.Column(db.String(200), nullable=False, default="")
+    company = db.Column(db.String(200), nullable=False, default="")
+    location = db.Column(db.String(200), nullable=False, default="")
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+# Pre-crawler bookkeeping: last attempt per (query, source), so restarts resume
+# where they left off and failing sources aren't retried on every cycle
+class CrawlProgress(db.Model):
+    __tablename__ = "crawl_progress"
+    id = db.Column(db.Integer, primary_key=True)
+    query_key = db.Column(db.String(600), nullable=False)
+    source = db.Column(db.String(50), nullable=False)
+    last_attempt_at = db.Column(db.DateTime, nullable=False)
+    last_state = db.Column(db.String(20), nullable=False)  # done / failed
+    __table_args__ = (db.UniqueConstraint("query_key", "source"),)
 
 # Subscriptions (users can subscribe for job alerts)
 class Subscription(db.Model):
     __tablename__ = "subscriptions"
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
     role = db.Column(db.String(200), nullable=True)
     company = db.Column(db.String(200), nullable=True)
     location = db.Column(db.String(200), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # alert index version
 
 # Notifications table
 class Notification(db.Model):
     __tablename__ = "notifications"
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)
     message = db.Column(db.String(500), nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index("ix_notifications_user_read", "user_id", "is_read"),
+        db.Index("ux_notifications_user_job", "user_id", "job_id", unique=True),  # one alert per job
+    )
+
+# Alert matcher bookkeeping: jobs with a higher id haven't been matched yet
+class AlertProgress(db.Model):
+    __tablename__ = "alert_progress"
+    id = db.Column(db.Integer, primary_key=True)
+    last_job_id = db.Column(db.Integer, nullable=False, default=0)
+
+# ----------------- SCHEMA UPGRADES -----------------
+# Columns added after the first release. db.create_all() only creates missing
+# tables, so existing databases get these through ALTER TABLE.
+ADDED_COLUMNS = {
+    "jobs": {
+        "experience": "VARCHAR(100)",
+        "deadline": "VARCHAR(100)",
+        "skills": "TEXT",
+        "link_key": "VARCHAR(500)",
+        "last_seen_at": "DATETIME",
+        "canonical_id": "INTEGER REFERENCES jobs (id) ON DELETE SET NULL",
+    },
+    "notifications": {
+        "job_id": "INTEGER REFERENCES jobs (id) ON DELETE SET NULL",
+    },
+    "subscriptions": {
+        "updated_at": "DATETIME",
+    },
+}
+
+def upgrade_schema():
+    """
+    Bring an existing database up to the current models. Safe to run repeatedly.
+    """
+    db.create_all()
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+        _backfill_link_keys(conn)
+        conn.execute(text("UPDATE jobs SET last_seen_at = created_at WHERE last_seen_at IS NULL"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_jobs_source_created"))  # replaced by ix_jobs_source_seen
+    _rebuild_jobs_autoincrement()
+    with db.engine.begin() as conn:
+        # create_all() skips indexes on tables that already exist
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+def _backfill_link_keys(conn):
+    """
+    Fill link_key for rows stored before it existed, folding rows that turn out
+    to share a posting into the oldest one so the unique index can be built.
+    """
+    rows = conn.execute(text("SELECT id, link, source, company, role, location FROM jobs "
+                             "WHERE link_key IS NULL ORDER BY id")).mappings().all()
+    if not rows:
+        return
+    taken = dict(conn.execute(text("SELECT link_key, id FROM jobs WHERE link_key IS NOT NULL")).all())
+    for row in rows:
+        job_id, key = row["id"], posting_key(row)
+        keeper = taken.setdefault(key, job_id)
+        if keeper == job_id:
+            conn.execute(text("UPDATE jobs SET link_key = :key WHERE id = :id"), {"key": key, "id": job_id})
+            continue
+        conn.execute(text("UPDATE OR IGNORE cache_entry_jobs SET job_id = :keeper WHERE job_id = :id"),
+                     {"keeper": keeper, "id": job_id})
+        conn.execute(text("DELETE FROM cache_entry_jobs WHERE job_id = :id"), {"id": job_id})
+        conn.execute(text("DELETE FROM jobs WHERE id = :id"), {"id": job_id})
+
+def _rebuild_jobs_autoincrement():
+    """
+    Recreate a jobs table created without AUTOINCREMENT, which hands the id of
+    the newest row out again once it is deleted. Rows keep their ids; the
+    sequence starts past both them and the alert watermark. Indexes and the
+    jobs_fts triggers go with the old table and are recreated by
+    upgrade_schema() and job_search.ensure_index().
+    """
+    table = Job.__table__
+    with db.engine.connect() as conn:
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'")).scalar()
+        if "AUTOINCREMENT" in ddl.upper():
+            return
+        existing = {row[1] for row in conn.execute(text("PRAGMA table_info(jobs)"))}
+        columns = ", ".join(c.name for c in table.columns if c.name in existing)
+        conn.commit()
+        # Foreign keys off and legacy renames on, so notifications and cache_entry_jobs
+        # keep pointing at "jobs" rather than following the old table or cascading
+        conn.connection.driver_connection.executescript(f"""
+            PRAGMA foreign_keys=OFF;
+            PRAGMA legacy_alter_table=ON;
+            BEGIN;
+            ALTER TABLE jobs RENAME TO jobs_old;
+            {CreateTable(table).compile(dialect=conn.dialect)};
+            INSERT INTO jobs ({columns}) SELECT {columns} FROM jobs_old;
+            DROP TABLE jobs_old;
+            DELETE FROM sqlite_sequence WHERE name = 'jobs';
+            INSERT INTO sqlite_sequence (name, seq) SELECT 'jobs', max(
+                (SELECT coalesce(max(id), 0) FROM jobs), (SELECT coalesce(max(last_job_id), 0) FROM alert_progress));
+            COMMIT;
+            PRAGMA legacy_alter_table=OFF;
+            PRAGMA foreign_keys=ON;
+        """)
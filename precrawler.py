@@ -0,0 +1,248 @@
+# precrawler.py
+"""
+Background pre-crawler for popular (role, location) searches.
+
+    python precrawler.py              # run forever, one cycle every PRECRAWL_INTERVAL
+    python precrawler.py --once       # run a single cycle and exit
+
+Each cycle ranks role/location combinations from data/roles.csv and
+data/locations.csv by how often users searched them recently, then scrapes the
+top ones whose cached results are stale and stores them through SearchCache, so
+most dashboard searches are answered from the jobs table. Progress is kept in
+crawl_progress, so a restarted crawler picks up the combinations it hadn't reached.
+Re-crawls are delta crawls (delta.py): each source stops at the postings stored
+last time and only the new ones are scraped. With FETCH_MODE=browser each
+source's due queries run as one batch in the tabs of a single browser
+(executors/batch.py) instead of one browser session per query.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import argparse, math, os, threading, time
+
+from app import app, init_db, search_cache, load_csv
+from models import db, SearchHistory, SearchCacheEntry, CrawlProgress
+from search_cache import query_key
+from dedupe import dedupe_stored_jobs
+import delta
+from alerts import match_new_jobs
+from worker import source_calls, FETCH_MODE
+from executors import registry
+
+PRECRAWL_INTERVAL = int(os.environ.get("PRECRAWL_INTERVAL", 30 * 60))  # seconds between cycles
+PRECRAWL_BATCH = int(os.environ.get("PRECRAWL_BATCH", 20))             # combinations per cycle
+PRECRAWL_CONCURRENCY = int(os.environ.get("PRECRAWL_CONCURRENCY", 2))  # combinations crawled at once
+HISTORY_DAYS = 30         # search history considered for popularity
+HALF_LIFE_DAYS = 7        # a search this old counts half as much as one made now
+RETRY_AFTER = 60 * 60     # seconds before a failed (query, source) is tried again
+
+# Browser-mode batches: each source's batch query for a (role, location)
+BATCH_QUERY = {
+    "Naukri": lambda role, location: role,
+    "LinkedIn": lambda role, location: (role, "", location),
+    "Unstop": lambda role, location: role,
+}
+
+# Per-source politeness: minimum gap between request starts and max in flight
+POLITENESS = {
+    "Naukri": {"min_interval": 20, "max_concurrent": 1},
+    "LinkedIn": {"min_interval": 30, "max_concurrent": 1},
+    "Unstop": {"min_interval": 20, "max_concurrent": 1},
+}
+
+
+# ----------------- POLITENESS -----------------
+class Politeness:
+    def __init__(self, limits=POLITENESS):
+        self.limits = limits
+        self._slots = {name: threading.Semaphore(l["max_concurrent"]) for name, l in limits.items()}
+        self._next_start = {name: 0.0 for name in limits}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, source):
+        """
+        Block until `source` may be hit again, then hold one of its concurrency slots.
+        """
+        limit = self.limits.get(source)
+        if limit is None:
+            yield
+            return
+        with self._slots[source]:
+            with self._lock:
+                start = max(time.monotonic(), self._next_start[source])
+                self._next_start[source] = start + limit["min_interval"]
+            time.sleep(max(0.0, start - time.monotonic()))
+            yield
+
+
+# ----------------- POPULARITY -----------------
+def _norm(text):
+    return " ".join(text.lower().split())
+
+
+def popular_queries(limit=PRECRAWL_BATCH):
+    """
+    Top (role, location) pairs by time-decayed search count, restricted to the
+    dashboard's role/location lists. Padded with the first CSV rows when there
+    is not enough history yet.
+    """
+    roles = {_norm(r): r for r in load_csv("data/roles.csv")}
+    locations = {_norm(l): l for l in load_csv("data/locations.csv")}
+    locations[""] = ""
+
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=HISTORY_DAYS)
+    rows = (db.session.query(SearchHistory.role, SearchHistory.location, SearchHistory.created_at)
+            .filter(SearchHistory.created_at >= cutoff).all())
+
+    scores = {}
+    for role, location, created_at in rows:
+        r, l = _norm(role), _norm(location)
+        if r not in roles or l not in locations:
+            continue
+        age_days = (now - created_at).total_seconds() / 86400
+        scores[(r, l)] = scores.get((r, l), 0.0) + math.pow(0.5, age_days / HALF_LIFE_DAYS)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+    seen = set(ranked)
+    seed_roles = list(roles)[:limit]
+    seed_locations = [l for l in locations if l][:limit]
+    for r, l in zip(seed_roles, seed_locations):
+        if len(ranked) >= limit:
+            break
+        if (r, l) not in seen:
+            ranked.append((r, l))
+            seen.add((r, l))
+    return [(roles[r], locations[l]) for r, l in ranked]
+
+
+def is_due(key, source, now):
+    entry = SearchCacheEntry.query.filter_by(query_key=key, source=source).first()
+    if entry is not None and (now - entry.fetched_at).total_seconds() < search_cache.ttl:
+        return False
+    progress = CrawlProgress.query.filter_by(query_key=key, source=source).first()
+    if progress is not None and progress.last_state != "done" \
+            and (now - progress.last_attempt_at).total_seconds() < RETRY_AFTER:
+        return False
+    return True
+
+
+def record(key, source, state):
+    progress = CrawlProgress.query.filter_by(query_key=key, source=source).first()
+    if progress is None:
+        progress = CrawlProgress(query_key=key, source=source)
+        db.session.add(progress)
+    progress.last_attempt_at = datetime.utcnow()
+    progress.last_state = state
+    db.session.commit()
+
+
+# ----------------- CRAWL -----------------
+def crawl_one(role, location, politeness):
+    key = query_key(role, "", location)
+    crawled = 0
+    with app.app_context():
+        for source in source_calls(role, "", location):
+            if not is_due(key, source, datetime.utcnow()):
+                continue
+            call = lambda seen, source=source: source_calls(role, "", location, {source: seen})[source]()
+            with politeness.slot(source):
+                try:
+                    jobs, new, ok = delta.crawl(search_cache, key, source, call)
+                except Exception as e:
+                    print(f"Pre-crawl {source} '{key}' failed:", e)
+                    jobs, new, ok = [], 0, False
+            # Executors swallow their own errors and return [], so empty only counts as
+            # success when the crawl caught up with postings we already had
+            record(key, source, "done" if ok else "failed")
+            search_cache.put(key, source, jobs)
+            if ok:
+                print(f"Pre-crawl {source} '{key}': {new} new postings")
+            crawled += 1
+    return crawled
+
+
+def crawl_batch(source, queries, politeness):
+    """
+    Every due (role, location) in `queries` for one source, as a single batch.
+    The politeness gap is kept between tab loads inside the batch. Each cache
+    key settles against its own SeenTracker. Several keys can map to the same
+    batch query: Naukri and Unstop search without a location. Such a query is
+    crawled once, in full, and each key then picks its own new postings from it.
+    """
+    to_query, search = BATCH_QUERY[source], registry.load(source, "batch")
+    with app.app_context():
+        now = datetime.utcnow()
+        due = [(query_key(role, "", location), to_query(role, location))
+               for role, location in queries if is_due(query_key(role, "", location), source, now)]
+        seen = {key: delta.tracker(key, source) for key, _ in due}
+        db.session.commit()
+    if not due:
+        return 0
+    keys = {}   # batch query -> the cache keys it answers
+    for key, query in due:
+        keys.setdefault(query, []).append(key)
+    shared = {query for query, of in keys.items() if len(of) > 1}
+    tracked = {query: seen[of[0]] for query, of in keys.items() if query not in shared}  # shared ones run in full
+    with politeness.slot(source):
+        try:
+            results = search(list(keys), seen=tracked,
+                             start_interval=politeness.limits.get(source, {}).get("min_interval", 0))
+        except Exception as e:
+            print(f"Pre-crawl {source} batch failed:", e)
+            results = {}
+    with app.app_context():
+        for key, query in due:
+            found = results.get(query, [])
+            if query in shared:
+                found = seen[key].select(found)
+            jobs, new, ok = delta.settle(search_cache, key, source, found, seen[key])
+            record(key, source, "done" if ok else "failed")
+            search_cache.put(key, source, jobs)
+            if ok:
+                print(f"Pre-crawl {source} '{key}': {new} new postings")
+    return len(due)
+
+
+def run_cycle(batch=PRECRAWL_BATCH, concurrency=PRECRAWL_CONCURRENCY, politeness=None):
+    politeness = politeness or Politeness()
+    with app.app_context():
+        queries = popular_queries(batch)
+    start = time.monotonic()
+    if FETCH_MODE == "browser":
+        # One browser per source, all of its queries in that browser's tabs
+        with ThreadPoolExecutor(max_workers=len(BATCH_QUERY), thread_name_prefix="precrawl") as pool:
+            crawled = sum(pool.map(lambda source: crawl_batch(source, queries, politeness), BATCH_QUERY))
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="precrawl") as pool:
+            crawled = sum(pool.map(lambda q: crawl_one(q[0], q[1], politeness), queries))
+    marked = notified = 0
+    if crawled:
+        with app.app_context():
+            marked = dedupe_stored_jobs()
+            notified = match_new_jobs()
+    print(f"Pre-crawl cycle: {len(queries)} queries, {crawled} source crawls, "
+          f"{marked} duplicates grouped, {notified} alerts in {time.monotonic() - start:.1f}s")
+    return crawled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-crawl popular role/location searches")
+    parser.add_argument("--once", action="store_true", help="run one cycle and exit")
+    parser.add_argument("--batch", type=int, default=PRECRAWL_BATCH)
+    parser.add_argument("--concurrency", type=int, default=PRECRAWL_CONCURRENCY)
+    parser.add_argument("--interval", type=int, default=PRECRAWL_INTERVAL)
+    args = parser.parse_args()
+
+    init_db()
+    politeness = Politeness()
+    while True:
+        run_cycle(args.batch, args.concurrency, politeness)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
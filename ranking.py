@@ -0,0 +1,126 @@
+# ranking.py
+"""
+BM25 relevance ranking for job results.
+
+The query is normalized and tokenized once. Role terms are matched against the
+job title and Naukri skills, company terms against the company, and location
+terms against the location. Each field is scored with BM25, using statistics
+from the candidate set, and the fields are combined with FIELD_WEIGHTS. The top k
+are selected with a heap, so ranking thousands of candidates stays cheap.
+"""
+import heapq, math, re
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+# Which query part is matched against which job field, and how much the field counts
+FIELD_WEIGHTS = {"role": 3.0, "skills": 1.5, "company": 2.0, "location": 1.0}
+QUERY_PART = {"role": "role", "skills": "role", "company": "company", "location": "location"}
+PHRASE_BONUS = 1.0   # extra (x field weight) when the whole query part appears verbatim
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _field_text(job, field):
+    value = job.get(field) or ""
+    return " ".join(value) if isinstance(value, (list, tuple)) else value
+
+
+class Ranker:
+    def __init__(self, role="", company="", location=""):
+        parts = {"role": role, "company": company, "location": location}
+        self.phrases = {field: " ".join(tokenize(parts[QUERY_PART[field]])) for field in FIELD_WEIGHTS}
+        self.terms = {field: set(phrase.split()) for field, phrase in self.phrases.items()}
+        self.fields = [field for field in FIELD_WEIGHTS if self.terms[field]]
+
+    def scores(self, jobs):
+        """
+        BM25 score for every job, in input order.
+        """
+        if not self.fields or not jobs:
+            return [0.0] * len(jobs)
+
+        # One pass: tokenize each field once, collect lengths and document frequencies
+        docs = []
+        total_len = dict.fromkeys(self.fields, 0)
+        df = {field: dict.fromkeys(self.terms[field], 0) for field in self.fields}
+        for job in jobs:
+            doc = {}
+            for field in self.fields:
+                tokens = tokenize(_field_text(job, field))
+                counts = {}
+                for tok in tokens:
+                    if tok in df[field]:
+                        counts[tok] = counts.get(tok, 0) + 1
+                for tok in counts:
+                    df[field][tok] += 1
+                total_len[field] += len(tokens)
+                doc[field] = (len(tokens), counts, " ".join(tokens))
+            docs.append(doc)
+
+        n = len(jobs)
+        idf = {field: {t: math.log(1 + (n - d + 0.5) / (d + 0.5)) for t, d in df[field].items()}
+               for field in self.fields}
+        avg_len = {field: (total_len[field] / n) or 1.0 for field in self.fields}
+
+        scores = []
+        for doc in docs:
+            score = 0.0
+            for field in self.fields:
+                length, counts, text = doc[field]
+                weight = FIELD_WEIGHTS[field]
+                norm = K1 * (1 - B + B * length / avg_len[field])
+                for tok, tf in counts.items():
+                    score += weight * idf[field][tok] * tf * (K1 + 1) / (tf + norm)
+                if counts and self.phrases[field] in text:
+                    score += weight * PHRASE_BONUS
+            scores.append(score)
+        return scores
+
+    def strong(self, job):
+        """
+        True when every query term shows up in a field it is matched against
+        (role terms in the title or skills). Needs no candidate statistics, so
+        it works on jobs one at a time as they stream in.
+        """
+        if not self.fields:
+            return False
+        found = {}
+        for field in self.fields:
+            found.setdefault(QUERY_PART[field], set()).update(
+                tok for tok in tokenize(_field_text(job, field)) if tok in self.terms[field])
+        return all(found[QUERY_PART[field]] >= self.terms[field] for field in self.fields)
+
+    def top(self, jobs, k=50):
+        """
+        The k most relevant jobs, best first; ties keep their input order.
+        """
+        scores = self.scores(jobs)
+        best = heapq.nlargest(k, range(len(jobs)), key=lambda i: (scores[i], -i))
+        return [jobs[i] for i in best]
+
+
+def rank_jobs(jobs, role="", company="", location="", limit=50):
+    return Ranker(role, company, location).top(jobs, limit)
+
+
+class TopFilled:
+    """
+    Called with each job as it arrives; returns True once `k` distinct strong
+    matches (see Ranker.strong) have been seen, i.e. the top k is already full
+    of highly relevant results and live sources can stop.
+    """
+
+    def __init__(self, role="", company="", location="", k=50):
+        self.ranker = Ranker(role, company, location)
+        self.k = k
+        self.links = set()
+
+    def __call__(self, job):
+        link = job.get("link")
+        if link and link not in self.links and self.ranker.strong(job):
+            self.links.add(link)
+        return len(self.links) >= self.k
@@ -0,0 +1,163 @@
+# search_cache.py
+"""
+Query-keyed cache of scrape results.
+
+Entries are keyed by (normalized query, source) and persisted in the jobs table
+(through search_cache / cache_entry_jobs) with an in-process LRU in front.
+Stale entries are served immediately and refreshed in the background.
+The LRU is per process; each copy is re-read from the database after
+LRU_RECHECK seconds, so refreshes and invalidations made by other processes
+show up without a restart.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+import threading, time
+
+from models import db, Job, SearchCacheEntry, cache_entry_jobs
+from storage import upsert_jobs
+from executors.record import JobRecord
+
+CACHE_TTL = 15 * 60   # seconds before an entry is stale
+LRU_SIZE = 256        # (query, source) entries kept in memory
+LRU_RECHECK = 30      # seconds before an LRU copy is re-read from the database
+
+
+def query_key(role="", company="", location=""):
+    """
+    Normalize a search so "Data  Scientist" and "data scientist" share an entry.
+    """
+    return "|".join(" ".join(part.lower().split()) for part in (role, company, location))
+
+
+class SearchCache:
+    def __init__(self, app=None, ttl=CACHE_TTL, lru_size=LRU_SIZE):
+        self.app = app
+        self.ttl = ttl
+        self.lru_size = lru_size
+        self._lru = OrderedDict()   # (key, source) -> (jobs, fetched_at epoch, loaded_at monotonic)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    # ----------------- LOOKUP -----------------
+    def get(self, key, source):
+        """
+        Returns (jobs, fresh) or None on a miss.
+        """
+        entry = self._lru_get(key, source)
+        if entry is None:
+            entry = self._load(key, source)
+            if entry is None:
+                return None
+            self._lru_put(key, source, entry)
+        jobs, fetched_at, _ = entry
+        return [job.to_dict() for job in jobs], time.time() - fetched_at < self.ttl
+
+    def fetch(self, key, source, loader):
+        """
+        Cached jobs for (key, source), or None on a miss.
+        A stale hit is returned as-is and `loader` is run in the background to refresh it.
+        Returns (jobs, state) with state "hit" or "stale".
+        """
+        cached = self.get(key, source)
+        if cached is None:
+            return None
+        jobs, fresh = cached
+        if fresh:
+            return jobs, "hit"
+        self.refresh_async(key, source, loader)
+        return jobs, "stale"
+
+    def refresh_async(self, key, source, loader):
+        with self._lock:
+            if (key, source) in self._refreshing:
+                return
+            self._refreshing.add((key, source))
+
+        def refresh():
+            try:
+                jobs = loader()
+                with self.app.app_context():
+                    self.put(key, source, jobs)
+            except Exception as e:
+                print(f"Cache refresh failed for {source} '{key}':", e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard((key, source))
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    # ----------------- STORE -----------------
+    def put(self, key, source, jobs):
+        """
+        Persist a scrape result. Empty results are not cached so a transient
+        failure doesn't hide a source for a whole TTL.
+        """
+        if not jobs:
+            return
+        entry = SearchCacheEntry.query.filter_by(query_key=key, source=source).first()
+        if entry is None:
+            entry = SearchCacheEntry(query_key=key, source=source)
+            db.session.add(entry)
+        entry.fetched_at = datetime.utcnow()
+        db.session.flush()
+
+        positions = {}
+        for job_id in upsert_jobs(jobs):
+            positions.setdefault(job_id, len(positions))  # same posting twice keeps its first position
+        db.session.execute(cache_entry_jobs.delete().where(cache_entry_jobs.c.entry_id == entry.id))
+        db.session.execute(cache_entry_jobs.insert(), [
+            {"entry_id": entry.id, "job_id": job_id, "position": pos} for job_id, pos in positions.items()
+        ])
+        db.session.commit()
+        self._lru_put(key, source, ([JobRecord.from_dict(job) for job in jobs], time.time(), time.monotonic()))
+
+    def invalidate(self, key=None, source=None):
+        """
+        Drop cache entries matching key and/or source (everything if neither is given).
+        Returns the number of stored entries removed.
+        """
+        query = SearchCacheEntry.query
+        if key is not None:
+            query = query.filter_by(query_key=key)
+        if source is not None:
+            query = query.filter_by(source=source)
+        ids = [e.id for e in query.all()]
+        if ids:
+            db.session.execute(cache_entry_jobs.delete().where(cache_entry_jobs.c.entry_id.in_(ids)))
+            SearchCacheEntry.query.filter(SearchCacheEntry.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+        with self._lock:
+            for k, s in list(self._lru):
+                if (key is None or k == key) and (source is None or s == source):
+                    del self._lru[(k, s)]
+        return len(ids)
+
+    # ----------------- INTERNALS -----------------
+    def _load(self, key, source):
+        entry = SearchCacheEntry.query.filter_by(query_key=key, source=source).first()
+        if entry is None:
+            return None
+        rows = (Job.query.join(cache_entry_jobs, cache_entry_jobs.c.job_id == Job.id)
+                .filter(cache_entry_jobs.c.entry_id == entry.id)
+                .order_by(cache_entry_jobs.c.position).all())
+        fetched_at = entry.fetched_at.replace(tzinfo=timezone.utc).timestamp()
+        return [row.to_record() for row in rows], fetched_at, time.monotonic()
+
+    def _lru_get(self, key, source):
+        with self._lock:
+            entry = self._lru.get((key, source))
+            if entry is None:
+                return None
+            if time.monotonic() - entry[2] > LRU_RECHECK:
+                del self._lru[(key, source)]
+                return None
+            self._lru.move_to_end((key, source))
+            return entry
+
+    def _lru_put(self, key, source, entry):
+        with self._lock:
+            self._lru[(key, source)] = entry
+            self._lru.move_to_end((key, source))
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
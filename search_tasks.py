@@ -0,0 +1,177 @@
+# search_tasks.py
+"""
+SQLite-backed queue of search tasks shared by the web app and the scraping workers.
+
+The web process only enqueues tasks and reads their progress; worker processes
+(see worker.py) claim queued tasks, write each source's jobs as they arrive and
+mark the task finished. Any number of worker processes can share one queue file,
+including processes on other hosts when the file lives on storage with working
+file locks.
+"""
+from contextlib import closing
+import json, os, sqlite3, time, uuid
+
+QUEUE_DB = os.environ.get("QUEUE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "queue.db"))
+TASK_TTL = 10 * 60      # seconds a finished task stays pollable
+STALE_AFTER = 60        # seconds without a heartbeat before a running task is requeued
+QUEUED_TIMEOUT = 5 * 60  # seconds a task may wait for a worker before it is given up
+EXPIRED_ERROR = "no worker picked up the search in time"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER,
+    role TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    sources TEXT NOT NULL,                 -- JSON list, in display order
+    state TEXT NOT NULL DEFAULT 'queued',  -- queued / running / done / expired
+    version INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_tasks_state_created ON tasks (state, created_at);
+CREATE TABLE IF NOT EXISTS task_results (
+    task_id TEXT NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,                  -- JSON
+    jobs TEXT NOT NULL,                    -- JSON list
+    PRIMARY KEY (task_id, source)
+);
+"""
+
+
+class TaskQueue:
+    def __init__(self, path=QUEUE_DB, ttl=TASK_TTL, stale_after=STALE_AFTER, queued_timeout=QUEUED_TIMEOUT):
+        self.path = path
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.queued_timeout = queued_timeout
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return closing(conn)
+
+    # ----------------- WEB SIDE -----------------
+    def enqueue(self, role="", company="", location="", user_id=None, sources=()):
+        task_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO tasks (id, user_id, role, company, location, sources, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (task_id, user_id, role, company, location, json.dumps(list(sources)), time.time()),
+            )
+        return task_id
+
+    def snapshot(self, task_id):
+        """
+        Current progress of a task, or None if it doesn't exist (or has expired).
+        """
+        with self._connect() as conn:
+            task = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if task is None:
+                return None
+            results = conn.execute("SELECT source, status, jobs FROM task_results WHERE task_id = ?",
+                                   (task_id,)).fetchall()
+
+        expired = task["state"] == "expired"
+        status = {name: {"state": "failed" if expired else "pending", "count": 0, "elapsed": 0,
+                         "error": EXPIRED_ERROR if expired else ""}
+                  for name in json.loads(task["sources"])}
+        jobs = []
+        for row in results:
+            status[row["source"]] = json.loads(row["status"])
+            jobs.extend(json.loads(row["jobs"]))
+        return {
+            "id": task["id"],
+            "user_id": task["user_id"],
+            "role": task["role"],
+            "company": task["company"],
+            "location": task["location"],
+            "jobs": jobs,
+            "status": status,
+            "done": task["state"] in ("done", "expired"),
+            "version": task["version"],
+        }
+
+    # ----------------- WORKER SIDE -----------------
+    def claim(self, worker):
+        """
+        Atomically take the oldest queued task. Returns the task row or None.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                task = conn.execute(
+                    "SELECT * FROM tasks WHERE state = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if task is not None:
+                    conn.execute(
+                        "UPDATE tasks SET state = 'running', worker = ?, heartbeat_at = ? WHERE id = ?",
+                        (worker, time.time(), task["id"]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return task
+
+    def heartbeat(self, task_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE tasks SET heartbeat_at = ? WHERE id = ?", (time.time(), task_id))
+
+    def add_result(self, task_id, source, jobs, status):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO task_results (task_id, source, status, jobs) VALUES (?, ?, ?, ?)",
+                (task_id, source, json.dumps(status), json.dumps([dict(job) for job in jobs])),
+            )
+            conn.execute("UPDATE tasks SET version = version + 1, heartbeat_at = ? WHERE id = ?",
+                         (time.time(), task_id))
+
+    def finish(self, task_id):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET state = 'done', version = version + 1, finished_at = ? WHERE id = ?",
+                (time.time(), task_id),
+            )
+
+    # ----------------- MAINTENANCE -----------------
+    def requeue_stale(self):
+        """
+        Put back tasks whose worker stopped heartbeating (crashed or was killed).
+        """
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE tasks SET state = 'queued', worker = NULL "
+                "WHERE state = 'running' AND heartbeat_at < ?",
+                (time.time() - self.stale_after,),
+            )
+            return cur.rowcount
+
+    def prune(self):
+        """
+        Give up on tasks that have waited longer than queued_timeout for a
+        worker (their snapshot reports every source failed), and delete
+        finished and given-up tasks older than the ttl. Returns how many
+        tasks were expired or deleted.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            expired = conn.execute(
+                "UPDATE tasks SET state = 'expired', version = version + 1, finished_at = ? "
+                "WHERE state = 'queued' AND created_at < ?",
+                (now, now - self.queued_timeout),
+            ).rowcount
+            deleted = conn.execute("DELETE FROM tasks WHERE state IN ('done', 'expired') AND finished_at < ?",
+                                   (now - self.ttl,)).rowcount
+            return expired + deleted
+
@@ -0,0 +1,79 @@
+# storage.py
+"""
+SQLite connection settings and bulk job writes.
+
+Every connection runs in WAL mode with a busy timeout, so the web app can read
+while workers and the pre-crawler write, and writers wait their turn instead of
+failing with "database is locked". Scraped jobs are written with batched
+INSERT ... ON CONFLICT(link_key) DO UPDATE statements keyed on the normalized
+link (models.posting_key()), one round trip per UPSERT_CHUNK rows instead of
+a query per posting.
+"""
+from datetime import datetime
+
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from models import db, Job, job_values
+
+UPSERT_CHUNK = 500
+KEPT_COLUMNS = ("experience", "deadline", "skills")  # not every scrape shows these; a stored value outlives a NULL
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",       # readers don't block the writer and vice versa
+    "synchronous": "NORMAL",     # safe with WAL, far fewer fsyncs than FULL
+    "busy_timeout": 30000,       # ms to wait for a lock before giving up
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -16000,        # KiB
+}
+
+
+# ----------------- CONNECTIONS -----------------
+def _apply_pragmas(dbapi_conn, _record):
+    cursor = dbapi_conn.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def configure_engine(app):
+    """
+    Apply SQLITE_PRAGMAS to every new connection of the app's engine.
+    """
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _apply_pragmas)
+
+
+# ----------------- JOBS -----------------
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def upsert_jobs(jobs):
+    """
+    Insert new postings and refresh existing ones in bulk. Returns the job ids
+    in input order. Postings are matched on posting_key(): the normalized
+    link, or source, company, role and location for jobs without one. When one
+    appears twice in `jobs` the first copy wins. An update keeps the stored
+    KEPT_COLUMNS the scrape came back without, and every posting written gets
+    last_seen_at = now, new or not. Does not commit.
+    """
+    now = datetime.utcnow()
+    rows = [dict(job_values(job), last_seen_at=now) for job in jobs]
+    keyed = {}
+    for values in rows:
+        keyed.setdefault(values["link_key"], values)
+
+    table = Job.__table__
+    stmt = insert(table)
+    updates = {column: stmt.excluded[column] for column in [*job_values({}), "last_seen_at"] if column != "link_key"}
+    updates.update({column: func.coalesce(stmt.excluded[column], table.c[column]) for column in KEPT_COLUMNS})
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.link_key], set_=updates)
+    ids = {}
+    for chunk in _chunks(list(keyed.values()), UPSERT_CHUNK):
+        db.session.execute(stmt, chunk)
+        ids.update(db.session.execute(
+            select(table.c.link_key, table.c.id).where(table.c.link_key.in_([v["link_key"] for v in chunk]))).all())
+    return [ids[values["link_key"]] for values in rows]
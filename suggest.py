@@ -0,0 +1,127 @@
+# suggest.py
+"""
+In-memory autocomplete index for roles, companies and locations.
+
+Built once from a list of strings (CSV order is treated as popularity order).
+Lookups are served from precomputed normalized forms:
+  - a sorted array of full names and one of individual tokens, searched with
+    bisect for prefix matches (a flattened prefix trie: same lookups, a fraction
+    of the memory of per-character dict nodes at hundreds of thousands of entries)
+  - a trigram index for substring matches anywhere in the name, with a linear
+    scan for queries too short to have a trigram
+"""
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+import heapq, re
+
+_TOKEN = re.compile(r"[a-z0-9+#.]+")
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def _grams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _contains(sorted_ids, i):
+    pos = bisect_left(sorted_ids, i)
+    return pos < len(sorted_ids) and sorted_ids[pos] == i
+
+
+class SuggestIndex:
+    def __init__(self, items):
+        self.items = list(dict.fromkeys(items))  # drop duplicates, keep first (most popular) position
+        self.norm = [normalize(item) for item in self.items]
+
+        self.full_keys = sorted((n, i) for i, n in enumerate(self.norm))
+        self.token_keys = sorted((tok, i) for i, n in enumerate(self.norm) for tok in set(_TOKEN.findall(n)))
+
+        grams = {}
+        for i, n in enumerate(self.norm):
+            for g in _grams(n):
+                grams.setdefault(g, array("I")).append(i)  # ids are appended in order, so lists stay sorted
+        self.grams = grams
+
+        self.suggest = lru_cache(maxsize=4096)(self._suggest)
+
+    def __len__(self):
+        return len(self.items)
+
+    # ----------------- LOOKUPS -----------------
+    def _prefix_ids(self, keys, prefix, k):
+        """
+        The k lowest ids whose key starts with `prefix`.
+        """
+        lo = bisect_left(keys, (prefix,))
+        hi = bisect_left(keys, (prefix + "\uffff",))
+        return heapq.nsmallest(k, (i for _, i in keys[lo:hi]))
+
+    def _exact_ids(self, q):
+        lo = bisect_left(self.full_keys, (q,))
+        ids = []
+        while lo < len(self.full_keys) and self.full_keys[lo][0] == q:
+            ids.append(self.full_keys[lo][1])
+            lo += 1
+        return ids
+
+    def _substring_ids(self, q, k, exclude):
+        """
+        First k ids containing `q`, found by intersecting trigram postings
+        (smallest list first) and confirming with a plain substring check.
+        """
+        postings = sorted((self.grams.get(g) for g in _grams(q)), key=lambda p: len(p) if p else 0)
+        if not postings or not postings[0]:
+            return []
+        found = []
+        for i in postings[0]:
+            if i in exclude or not all(_contains(p, i) for p in postings[1:]):
+                continue
+            if q in self.norm[i]:
+                found.append(i)
+                if len(found) >= k:
+                    break
+        return found
+
+    def _scan_ids(self, q, k, exclude):
+        """
+        First k ids containing `q`, by a plain scan: for 1-2 character queries,
+        which have no trigrams to intersect.
+        """
+        found = []
+        for i, n in enumerate(self.norm):
+            if q in n and i not in exclude:
+                found.append(i)
+                if len(found) >= k:
+                    break
+        return found
+
+    def _suggest(self, query, k=5):
+        """
+        Top-k matches for `query`: exact, then name prefix, then word prefix,
+        then substring anywhere in the name; ties keep list (popularity) order.
+        """
+        q = normalize(query)
+        if not q:
+            return tuple(self.items[:k])
+
+        ranked = []  # ids, best tier first
+        seen = set()
+
+        def take(ids):
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    ranked.append(i)
+
+        take(self._exact_ids(q))
+        take(self._prefix_ids(self.full_keys, q, k))
+        if len(ranked) < k and " " not in q:
+            take(self._prefix_ids(self.token_keys, q, k + len(ranked)))
+        if len(ranked) < k:
+            find = self._substring_ids if len(q) >= 3 else self._scan_ids
+            take(find(q, k - len(ranked), seen))
+
+        return tuple(self.items[i] for i in ranked[:k])
@@ -0,0 +1,42 @@
+# tests/conftest.py
+"""
+Shared setup: the repo root on sys.path, and every database and queue in a
+throwaway directory so a test run never touches instance/.
+"""
+import os, sys, tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # app.py reads data/*.csv relative to the repo
+
+_workdir = tempfile.mkdtemp(prefix="jobfinder-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_workdir, "test.db")
+os.environ["QUEUE_DB"] = os.path.join(_workdir, "queue.db")
+os.environ["METRICS_ENABLED"] = "0"
+
+
+def fixture(path, page=1):
+    """
+    A recorded page from benchmarks/fixtures, as fixture_server.py serves it.
+    """
+    with open(os.path.join(FIXTURES, path), encoding="utf-8") as f:
+        return f.read().replace("__PAGE__", str(page))
+
+
+@pytest.fixture
+def app_db():
+    """
+    An app context on an upgraded, empty database.
+    """
+    from app import app, init_db
+    from models import db
+    init_db()
+    with app.app_context():
+        yield db
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
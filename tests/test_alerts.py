@@ -0,0 +1,98 @@
+# tests/test_alerts.py
+from alerts import SubscriptionIndex, load_index, match_new_jobs
+from dedupe import dedupe_stored_jobs
+from models import Job, Notification, Subscription, User
+from storage import upsert_jobs
+
+
+def posting(role, source="Naukri", n=1, company="Acme", location="Bengaluru"):
+    return {"role": role, "company": company, "location": location, "source": source,
+            "link": f"https://{source.lower()}.example/jobs/{n}"}
+
+
+def add_user(db, name, **subscription):
+    user = User(username=name, email=f"{name}@example.com", password="x")
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(Subscription(user_id=user.id, **subscription))
+    db.session.commit()
+    return user.id
+
+
+def notified(db):
+    return sorted((n.user_id, n.job_id) for n in Notification.query)
+
+
+def test_index_matches_every_term_after_normalization():
+    index = SubscriptionIndex([(1, "data scientist", None, "bangalore"), (2, "python", "google", None),
+                               (3, None, None, None)])
+    assert len(index) == 2
+    assert index.match({"role": "Senior Data Scientist", "company": "Acme", "location": "Bengaluru, Karnataka"}) == {1}
+    assert index.match({"role": "Python Developer", "company": "Google India Pvt Ltd", "location": ""}) == {2}
+    assert index.match({"role": "Data Engineer", "company": "Acme", "location": "Bangalore"}) == set()
+
+
+def test_first_run_starts_from_stored_jobs(app_db):
+    add_user(app_db, "ana", role="python")
+    upsert_jobs([posting("Python Developer")])
+    app_db.session.commit()
+    assert match_new_jobs() == 0  # the backlog is not alerted on
+    upsert_jobs([posting("Python Developer", n=2)])
+    app_db.session.commit()
+    assert match_new_jobs() == 1
+    assert match_new_jobs() == 0
+
+
+def test_alerts_once_across_a_stored_dedupe(app_db):
+    ana = add_user(app_db, "ana", role="data scientist")
+    match_new_jobs()
+    upsert_jobs([posting("Data Scientist", "Naukri")])
+    app_db.session.commit()
+    assert match_new_jobs() == 1
+
+    # The same posting turns up on LinkedIn; the pre-crawler dedupes before matching
+    upsert_jobs([posting("Data Scientist", "LinkedIn", location="Bangalore")])
+    app_db.session.commit()
+    assert dedupe_stored_jobs() == 1
+    assert match_new_jobs() == 0
+
+    # Re-scrapes of either copy neither add rows nor alert again
+    upsert_jobs([posting("Data Scientist", "Naukri"), posting("Data Scientist", "LinkedIn", location="Bangalore")])
+    app_db.session.commit()
+    assert dedupe_stored_jobs() == 0
+    assert match_new_jobs() == 0
+    keeper = Job.query.filter_by(source="Naukri").one()
+    assert notified(app_db) == [(ana, keeper.id)]
+
+
+def test_deleted_newest_id_is_not_reused(app_db):
+    add_user(app_db, "ana", role="python")
+    match_new_jobs()
+    first, newest = upsert_jobs([posting("Java Developer"), posting("Java Developer", n=2)])
+    app_db.session.commit()
+    match_new_jobs()
+    app_db.session.delete(app_db.session.get(Job, newest))
+    app_db.session.commit()
+
+    (job_id,) = upsert_jobs([posting("Python Developer", n=3)])
+    app_db.session.commit()
+    assert job_id > newest
+    assert match_new_jobs() == 1
+
+
+def test_count_skips_pairs_already_notified(app_db):
+    ana = add_user(app_db, "ana", role="python")
+    match_new_jobs()
+    ids = upsert_jobs([posting("Python Developer", n=n) for n in range(3)])
+    app_db.session.add(Notification(user_id=ana, job_id=ids[0], message="sent by hand"))
+    app_db.session.commit()
+    assert match_new_jobs() == 2
+
+
+def test_index_rebuilt_when_a_subscription_is_edited(app_db):
+    add_user(app_db, "ana", role="python")
+    assert load_index().match({"role": "Java Developer"}) == set()
+    subscription = Subscription.query.one()
+    subscription.role = "java"
+    app_db.session.commit()
+    assert load_index().match({"role": "Java Developer"}) == {subscription.user_id}
@@ -0,0 +1,73 @@
+# tests/test_dedupe.py
+from dedupe import SMALL_BLOCK, dedupe_jobs, dedupe_stored_jobs, find_groups, merge_jobs
+from job_search import search_jobs
+from models import Job
+from storage import upsert_jobs
+
+NAUKRI = {"role": "Data Scientist", "company": "Acme Technologies Pvt Ltd", "location": "Bengaluru, Karnataka",
+          "link": "https://www.naukri.com/job-listings-data-scientist-1", "source": "Naukri",
+          "skills": ["python", "sql"], "experience": "2-4 Yrs"}
+LINKEDIN = {"role": "Data Scientist", "company": "Acme", "location": "Bangalore",
+            "link": "https://www.linkedin.com/jobs/view/1", "source": "LinkedIn"}
+OTHER = {"role": "Java Developer", "company": "Acme", "location": "Bangalore",
+         "link": "https://www.linkedin.com/jobs/view/2", "source": "LinkedIn"}
+
+
+def test_normalized_key_groups_across_sources():
+    assert find_groups([NAUKRI, OTHER, LINKEDIN]) == [[0, 2], [1]]
+
+
+def test_near_duplicate_titles_in_small_block():
+    jobs = [dict(LINKEDIN, role="Senior Python Developer"), dict(NAUKRI, role="Sr. Python Developer"), OTHER]
+    assert find_groups(jobs) == [[0, 1], [2]]
+
+
+def test_minhash_buckets_large_block():
+    titles = ["Data Analyst", "Java Developer", "Office Manager", "HR Executive", "Sales Lead",
+              "Product Designer", "QA Engineer", "DevOps Engineer", "Accountant", "Support Engineer",
+              "Senior Python Developer", "Senior Python Developer II"]
+    assert len(titles) > SMALL_BLOCK
+    jobs = [{"role": t, "company": "Acme", "location": "Pune"} for t in titles]
+    assert find_groups(jobs) == [[i] for i in range(10)] + [[10, 11]]
+
+
+def test_merge_prefers_linkedin_link_and_fills_fields():
+    merged = merge_jobs([NAUKRI, LINKEDIN])
+    assert merged["link"] == LINKEDIN["link"]
+    assert merged["skills"] == ["python", "sql"]
+    assert merged["experience"] == "2-4 Yrs"
+    assert merged["sources"] == ["LinkedIn", "Naukri"]
+    assert merged["links"] == {"LinkedIn": LINKEDIN["link"], "Naukri": NAUKRI["link"]}
+    # merging an already merged posting again keeps every link
+    assert merge_jobs([merged, dict(NAUKRI, source="Unstop", link="https://unstop.com/j/1")])["sources"] == \
+        ["LinkedIn", "Naukri", "Unstop"]
+
+
+def test_dedupe_jobs_keeps_first_seen_order():
+    out = dedupe_jobs([OTHER, NAUKRI, LINKEDIN])
+    assert [j["role"] for j in out] == ["Java Developer", "Data Scientist"]
+
+
+def test_stored_dedupe_is_idempotent_and_survives_rescrapes(app_db):
+    upsert_jobs([NAUKRI, OTHER])
+    upsert_jobs([LINKEDIN])
+    app_db.session.commit()
+    assert dedupe_stored_jobs() == 1
+    assert dedupe_stored_jobs() == 0
+
+    # Both sources scrape the posting again, Naukri this time without skills
+    upsert_jobs([dict(NAUKRI, skills=None, experience=None)])
+    upsert_jobs([LINKEDIN])
+    app_db.session.commit()
+    assert Job.query.count() == 3
+    assert dedupe_stored_jobs() == 0
+
+    keeper = Job.query.filter_by(source="Naukri").one()
+    assert keeper.canonical_id is None
+    assert keeper.to_dict()["skills"] == ["python", "sql"]  # not overwritten with NULL
+    assert Job.query.filter_by(link=LINKEDIN["link"]).one().canonical_id == keeper.id
+
+    hits = search_jobs("scientist")
+    assert len(hits) == 1
+    assert hits[0]["sources"] == ["LinkedIn", "Naukri"]
+    assert hits[0]["skills"] == ["python", "sql"]
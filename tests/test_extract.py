@@ -0,0 +1,67 @@
+# tests/test_extract.py
+import json
+
+from conftest import fixture
+from executors.extract import extract_cards, extract_fragments
+from executors.health import health
+from executors.http_fetch import parse_naukri, parse_unstop
+
+
+def test_naukri_cards():
+    jobs = extract_cards(fixture("naukri/cards.html"), "Naukri", "https://www.naukri.com")
+    assert len(jobs) == 10
+    first = jobs[0].to_dict()
+    assert first["role"] == "Software Engineer"
+    assert first["company"] == "Infosys Limited"
+    assert first["location"] == "Bengaluru, Karnataka"
+    assert first["experience"] == "1-4 Yrs"
+    assert first["skills"] == ["python", "sql", "aws"]
+    assert first["link"].startswith("https://www.naukri.com/job-listings-software-engineer-0-p1")
+    assert {job["source"] for job in jobs} == {"Naukri"}
+
+
+def test_linkedin_cards():
+    html = '<ul class="jobs-search__results-list">' + fixture("linkedin/cards.html") + "</ul>"
+    jobs = extract_cards(html, "LinkedIn")
+    assert len(jobs) == 10
+    assert jobs[0]["role"] == "Software Engineer"
+    assert jobs[-1]["company"] == "PhonePe Private Limited"
+    assert all(job["link"].startswith("https://www.linkedin.com/jobs/view/") for job in jobs)
+
+
+def test_unstop_cards():
+    jobs = extract_cards(fixture("unstop/cards.html"), "Unstop", "https://unstop.com")
+    assert len(jobs) == 10
+    assert jobs[0]["link"] == "https://unstop.com/jobs/software-engineer-infosys-1001"
+
+
+def test_limit_and_fragments():
+    html = fixture("naukri/cards.html")
+    assert [job["role"] for job in extract_cards(html, "Naukri", limit=3)] == \
+        [job["role"] for job in extract_cards(html, "Naukri")[:3]]
+    fragments = html.split('<div class="srp-jobtuple-wrapper">')[1:]
+    assert len(extract_fragments(fragments, "Naukri")) == 10
+
+
+def test_card_missing_required_field_is_skipped():
+    assert extract_cards('<div class="cust-job-tuple"><span>no title</span></div>', "Naukri") == []
+
+
+def test_unparsed_cards_reach_only_their_own_run():
+    with health.run() as run:
+        extract_cards('<div class="cust-job-tuple"><span>no title</span></div>', "Naukri")
+    with health.run() as clean:
+        extract_cards(fixture("naukri/cards.html"), "Naukri")
+    assert run.unparsed
+    assert not clean.unparsed
+
+
+def test_http_json_parsers():
+    naukri = parse_naukri(json.loads(fixture("naukri/search.json", page=2)), "https://www.naukri.com/")
+    assert len(naukri) == 10
+    assert naukri[0]["link"] == "https://www.naukri.com/job-listings-software-engineer-0-p2?src=jobsearchDesk"
+    assert naukri[0]["skills"] == ("python", "sql", "aws")
+
+    unstop = parse_unstop(json.loads(fixture("unstop/search.json")), "https://unstop.com/")
+    assert len(unstop) == 10
+    assert unstop[0]["location"] == "Bengaluru"
@@ -0,0 +1,61 @@
+# tests/test_ranking.py
+from ranking import Ranker, TopFilled, rank_jobs
+
+
+def job(role, company="Acme", location="Pune", link=None, skills=None):
+    return {"role": role, "company": company, "location": location,
+            "link": f"https://x/{role}/{company}/{location}" if link is None else link, "skills": skills}
+
+
+JOBS = [
+    job("Java Developer"),
+    job("Senior Python Developer", location="Bangalore"),
+    job("Python Developer"),
+    job("Backend Engineer", skills=["python", "django"]),
+    job("Office Manager"),
+]
+
+
+def test_bm25_orders_by_relevance():
+    ranked = rank_jobs(JOBS, role="python developer", location="pune")
+    # exact title and location first; then the title match elsewhere; skills-only and partial matches after
+    assert [j["role"] for j in ranked[:2]] == ["Python Developer", "Senior Python Developer"]
+    assert ranked[-1]["role"] == "Office Manager"
+
+
+def test_title_outweighs_skills():
+    scores = Ranker(role="python").scores(JOBS)
+    assert scores[2] > scores[3] > 0
+    assert scores[0] == scores[4] == 0
+
+
+def test_rare_terms_count_more():
+    jobs = [job("Python Developer"), job("Rust Developer"), job("Go Developer"), job("Java Developer")]
+    scores = Ranker(role="python developer").scores(jobs)
+    assert scores[0] > scores[1] == scores[2] == scores[3] > 0
+
+
+def test_top_k_and_ties_keep_input_order():
+    jobs = [job("Python Developer", company=c) for c in "ABCDE"]
+    assert [j["company"] for j in Ranker(role="python").top(jobs, k=3)] == ["A", "B", "C"]
+
+
+def test_no_query_keeps_order():
+    assert rank_jobs(JOBS) == JOBS
+
+
+def test_strong_needs_every_term():
+    ranker = Ranker(role="python developer", location="pune")
+    assert ranker.strong(job("Python Developer"))
+    assert ranker.strong(job("Developer", skills=["python"]))
+    assert not ranker.strong(job("Python Developer", location="Delhi"))
+    assert not ranker.strong(job("Python Engineer"))
+
+
+def test_top_filled_counts_distinct_strong_matches():
+    enough = TopFilled(role="python", k=2)
+    assert not enough(job("Python Developer", link="https://x/1"))
+    assert not enough(job("Python Developer", link="https://x/1"))  # the same posting again
+    assert not enough(job("Java Developer", link="https://x/2"))
+    assert not enough(job("Python Developer", link=""))            # no link, can't be counted
+    assert enough(job("Python Engineer", link="https://x/3"))
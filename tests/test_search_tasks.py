@@ -0,0 +1,68 @@
+# tests/test_search_tasks.py
+import pytest
+
+from search_tasks import TaskQueue, EXPIRED_ERROR
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return TaskQueue(str(tmp_path / "queue.db"), ttl=60, stale_after=60, queued_timeout=60)
+
+
+def age(queue, task_id, column, seconds):
+    with queue._connect() as conn:
+        conn.execute(f"UPDATE tasks SET {column} = {column} - ? WHERE id = ?", (seconds, task_id))
+
+
+def test_claim_takes_oldest_once(queue):
+    first = queue.enqueue("python", sources=["Naukri"])
+    second = queue.enqueue("java", sources=["Naukri"])
+    assert queue.claim("w1")["id"] == first
+    assert queue.claim("w2")["id"] == second
+    assert queue.claim("w3") is None
+
+
+def test_results_and_finish_show_in_snapshot(queue):
+    task_id = queue.enqueue("python", sources=["Naukri", "LinkedIn"])
+    queue.claim("w1")
+    queue.add_result(task_id, "Naukri", [{"role": "Python Developer", "link": "https://x/1"}],
+                     {"state": "done", "count": 1, "elapsed": 1.0, "error": ""})
+    snap = queue.snapshot(task_id)
+    assert [job["role"] for job in snap["jobs"]] == ["Python Developer"]
+    assert snap["status"]["LinkedIn"]["state"] == "pending"
+    assert not snap["done"]
+    queue.finish(task_id)
+    assert queue.snapshot(task_id)["done"]
+
+
+def test_requeue_stale_running_task(queue):
+    task_id = queue.enqueue("python", sources=["Naukri"])
+    queue.claim("w1")
+    assert queue.requeue_stale() == 0  # still heartbeating
+    age(queue, task_id, "heartbeat_at", 120)
+    assert queue.requeue_stale() == 1
+    assert queue.claim("w2")["id"] == task_id
+
+
+def test_prune_expires_unclaimed_tasks(queue):
+    waiting = queue.enqueue("python", sources=["Naukri", "Unstop"])
+    fresh = queue.enqueue("java", sources=["Naukri"])
+    age(queue, waiting, "created_at", 120)
+    assert queue.prune() == 1
+    snap = queue.snapshot(waiting)
+    assert snap["done"]
+    assert {s["state"] for s in snap["status"].values()} == {"failed"}
+    assert snap["status"]["Unstop"]["error"] == EXPIRED_ERROR
+    assert queue.claim("w1")["id"] == fresh  # the expired one is never handed out
+
+
+def test_prune_deletes_old_finished_tasks(queue):
+    old = queue.enqueue("python", sources=["Naukri"])
+    recent = queue.enqueue("java", sources=["Naukri"])
+    for task_id in (old, recent):
+        queue.claim("w1")
+        queue.finish(task_id)
+    age(queue, old, "finished_at", 120)
+    assert queue.prune() == 1
+    assert queue.snapshot(old) is None
+    assert queue.snapshot(recent) is not None
@@ -0,0 +1,75 @@
+# tests/test_seen.py
+import delta
+from executors.http_fetch import _stream
+from executors.seen import SeenTracker
+from models import normalize_link
+from search_cache import query_key
+
+
+def links(*ns):
+    return [f"https://x/{n}" for n in ns]
+
+
+def test_new_postings_until_the_watermark():
+    seen = SeenTracker(links(1, 2, 3), watermark="https://x/1")
+    assert [seen.check(link) for link in links(9, 8, 1)] == [True, True, False]
+    assert seen.caught_up
+    assert seen.new == 2
+
+
+def test_run_of_known_postings_catches_up_without_the_watermark():
+    seen = SeenTracker(links(*range(10)), watermark="https://x/gone", run=3)
+    seen.check("https://x/1")
+    seen.check("https://x/new")    # a new posting resets the streak
+    seen.scan(links(2, 3))
+    assert not seen.caught_up
+    seen.check("https://x/4")
+    assert seen.caught_up
+
+
+def test_each_posting_counted_once():
+    seen = SeenTracker(links(1), run=2)
+    assert seen.check("https://x/9") and seen.check("https://x/9")
+    assert not seen.check("https://x/1") and not seen.check("https://x/1")
+    assert not seen.caught_up  # the repeat did not extend the streak
+    assert seen.new == 1
+
+
+def test_links_normalized_and_empty_ones_ignored():
+    seen = SeenTracker(["https://x/1"], key=normalize_link)
+    assert not seen.check("HTTPS://X/1/?utm_source=mail")
+    assert not seen.check("")
+    assert seen.select([{"link": "https://x/2"}, {"link": "https://x/1?trk=a"}]) == [{"link": "https://x/2"}]
+
+
+def test_nothing_stored_never_catches_up():
+    seen = SeenTracker()
+    assert seen.select([{"link": link} for link in links(1, 2, 3)]) and not seen.caught_up
+
+
+def test_http_stream_stops_after_first_page_once_caught_up():
+    pages = []
+
+    def fetch_page(page):
+        pages.append(page)
+        return [{"link": f"https://x/{page}-{i}"} for i in range(10)]
+
+    seen = SeenTracker(["https://x/1-2"], watermark="https://x/1-2")
+    jobs = list(_stream(fetch_page, 10, 40, seen))
+    assert len(jobs) == 9      # the rest of the page, minus the posting already stored
+    assert pages == [1]        # but no second page
+
+
+def test_delta_crawl_merges_new_postings_in_front(app_db):
+    from app import search_cache
+    key = query_key("python", "", "pune")
+    search_cache.put(key, "Naukri", [{"role": f"Python {n}", "company": "A", "link": link, "source": "Naukri"}
+                                     for n, link in enumerate(links(1, 2, 3))])
+
+    def call(seen):
+        return seen.select([{"role": "Python new", "company": "A", "link": link, "source": "Naukri"}
+                            for link in links(4, 1, 2)])
+
+    jobs, new, ok = delta.crawl(search_cache, key, "Naukri", call)
+    assert ok and new == 1
+    assert [job["link"] for job in jobs] == links(4, 1, 2, 3)
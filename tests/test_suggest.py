@@ -0,0 +1,43 @@
+# tests/test_suggest.py
+from suggest import SuggestIndex
+
+ROLES = ["Software Engineer", "Data Scientist", "Senior Software Engineer", "Data Analyst",
+         "Naval Architect", "Machine Learning Engineer", "DevOps Engineer", "software engineer"]
+
+
+def test_tiers_exact_then_prefix_then_word_then_substring():
+    index = SuggestIndex(["Data Engineer", "Engineer", "Engineering Manager", "Senior Engineer", "Reengineer"])
+    assert index.suggest("engineer", k=5) == ("Engineer", "Engineering Manager", "Data Engineer",
+                                              "Senior Engineer", "Reengineer")
+
+
+def test_prefix_keeps_list_order():
+    index = SuggestIndex(ROLES)
+    assert index.suggest("data", k=2) == ("Data Scientist", "Data Analyst")
+    # normalized query; name prefixes come before the name that only contains it
+    assert index.suggest("  SOFTWARE   eng", k=5) == ("Software Engineer", "software engineer",
+                                                    "Senior Software Engineer")
+
+
+def test_exact_repeats_are_dropped():
+    assert SuggestIndex(["A", "B", "A"]).items == ["A", "B"]
+
+
+def test_word_prefix_inside_name():
+    assert SuggestIndex(ROLES).suggest("learn", k=5) == ("Machine Learning Engineer",)
+
+
+def test_trigram_substring():
+    assert SuggestIndex(ROLES).suggest("ops", k=5) == ("DevOps Engineer",)
+    assert SuggestIndex(ROLES).suggest("xyz", k=5) == ()
+
+
+def test_short_queries_match_substrings():
+    index = SuggestIndex(ROLES)
+    assert index.suggest("av", k=5) == ("Naval Architect",)
+    assert set(index.suggest("ng", k=10)) == {"Software Engineer", "Senior Software Engineer", "Machine Learning Engineer",
+                                              "DevOps Engineer", "software engineer"}
+
+
+def test_empty_query_returns_most_popular():
+    assert SuggestIndex(ROLES).suggest("", k=3) == tuple(ROLES[:3])
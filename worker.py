@@ -0,0 +1,213 @@
+# worker.py
+"""
+Scraping worker tier. The web app only queues searches; these processes run them.
+
+    python worker.py --workers 3
+
+Each worker process claims tasks from the shared queue (search_tasks.py), serves
+each source from the cache or scrapes it, and writes every source's jobs back as
+soon as they arrive. Start as many worker processes, on as many hosts, as the
+queue file can be shared with.
+"""
+import argparse, multiprocessing, os, signal, socket, threading
+
+from app import app, init_db, search_cache, search_tasks
+from models import db
+from search_cache import query_key
+from alerts import match_new_jobs
+import delta
+from ranking import TopFilled
+from executors import registry
+from executors.runner import run_sources
+from executors.health import health
+from executors.metrics import count_cache
+
+WORKERS = int(os.environ.get("SEARCH_WORKERS", 2))          # worker processes per host
+DRIVER_POOL_WARM = int(os.environ.get("DRIVER_POOL_WARM", 0))  # browsers each worker pre-launches
+FETCH_MODE = os.environ.get("FETCH_MODE", "auto")            # auto (HTTP, browser fallback) / browser
+MAX_JOBS = 20             # jobs per source per search
+TOP_RESULTS = 50          # results /search shows; live sources stop once these are all strong matches
+POLL_INTERVAL = 0.5       # seconds between queue polls when idle
+HEARTBEAT_INTERVAL = 10   # seconds between heartbeats while a task runs
+
+
+# ----------------- SEARCH -----------------
+def source_streams(role, company, location, seen=None, limits=None):
+    """
+    One stream per source: a callable taking a cancel Event and returning a
+    generator of jobs (see executors/stream.py). `seen` maps a source to the
+    SeenTracker for a delta crawl (see delta.py); sources without one are
+    crawled in full. Executors are imported from the registry on first call,
+    so the browser stack only loads once a browser is actually needed.
+    `limits` maps a source to its max_jobs when it should differ from MAX_JOBS.
+    """
+    seen = seen or {}
+    limit = lambda name: (limits or {}).get(name, MAX_JOBS)
+    load = registry.load
+    browser = {
+        "Naukri": lambda cancel: load("Naukri")(query=role, max_jobs=limit("Naukri"),
+                                                seen=seen.get("Naukri"), cancel=cancel),
+        "LinkedIn": lambda cancel: load("LinkedIn")(role=role, location=location, company=company,
+                                                    max_jobs=limit("LinkedIn"), seen=seen.get("LinkedIn"),
+                                                    cancel=cancel),
+        "Unstop": lambda cancel: load("Unstop")(query=role, max_jobs=limit("Unstop"),
+                                                seen=seen.get("Unstop"), cancel=cancel),
+    }
+    if FETCH_MODE == "browser":
+        return browser
+    http = {
+        "Naukri": lambda cancel: load("Naukri", "http")(query=role, max_jobs=limit("Naukri"),
+                                                        seen=seen.get("Naukri"), cancel=cancel),
+        "LinkedIn": lambda cancel: load("LinkedIn", "http")(role=role, company=company, location=location,
+                                                            max_jobs=limit("LinkedIn"), seen=seen.get("LinkedIn"),
+                                                            cancel=cancel),
+        "Unstop": lambda cancel: load("Unstop", "http")(query=role, max_jobs=limit("Unstop"),
+                                                        seen=seen.get("Unstop"), cancel=cancel),
+    }
+    with_fallback = registry.resolve("executors.http_fetch:with_fallback")
+    return {name: (lambda cancel, name=name: with_fallback(name, lambda: http[name](cancel),
+                                                           lambda: browser[name](cancel), seen.get(name)))
+            for name in browser}
+
+
+def source_calls(role, company, location, seen=None):
+    """
+    Zero-argument calls returning each source's complete job list.
+    """
+    return {name: (lambda stream=stream: list(stream(None)))
+            for name, stream in source_streams(role, company, location, seen).items()}
+
+
+def gather_jobs(role, company, location, on_result=None, on_progress=None):
+    """
+    Serve each source from the cache when possible and stream the rest concurrently.
+    `on_result(name, jobs, status)` is called as each source's jobs become available,
+    `on_progress(name, jobs, status)` with the jobs so far while a source is running.
+    Live sources are stopped early once TOP_RESULTS strong matches are in.
+    Returns (jobs, source_status).
+    """
+    key = query_key(role, company, location)
+    jobs, status, misses = [], {}, {}
+    budgets = app.config["SOURCE_BUDGETS"]
+    # Slowed-down sources are asked for fewer jobs so they still finish in their budget
+    limits = {name: health.max_jobs(name, MAX_JOBS, budget) for name, budget in budgets.items()}
+
+    def refresh(name):
+        # Stale entries are refreshed with a delta crawl: only postings newer than the stored ones
+        def load():
+            with app.app_context():
+                call = lambda seen: source_calls(role, company, location, {name: seen})[name]()
+                return delta.crawl(search_cache, key, name, call)[0]
+        return load
+
+    for name, stream in source_streams(role, company, location, limits=limits).items():
+        cached = search_cache.fetch(key, name, refresh(name))
+        if cached is None:
+            count_cache(name, "miss")
+            misses[name] = stream
+            continue
+        cached_jobs, state = cached
+        count_cache(name, state)
+        jobs.extend(cached_jobs)
+        status[name] = {"state": "done", "count": len(cached_jobs), "elapsed": 0, "error": "", "cache": state}
+        if on_result:
+            on_result(name, cached_jobs, status[name])
+
+    def fetched_one(name, result, st):
+        if st["state"] == "done" and not st.get("partial"):  # cut-short results would hide the rest for a TTL
+            search_cache.put(key, name, result)
+        if on_result:
+            on_result(name, result, st)
+
+    if misses:
+        enough = TopFilled(role, company, location, k=TOP_RESULTS)
+        for job in jobs:
+            enough(job)  # cached results count towards the top too
+        fetched, fetched_status = run_sources(
+            misses,
+            deadline=app.config["SEARCH_DEADLINE"],
+            budgets=budgets,
+            on_result=fetched_one,
+            on_progress=on_progress,
+            enough=enough,
+        )
+        jobs.extend(fetched)
+        status.update(fetched_status)
+
+    return jobs, status
+
+
+def run_task(task):
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            search_tasks.heartbeat(task["id"])
+
+    threading.Thread(target=beat, daemon=True).start()
+    try:
+        with app.app_context():
+            publish = lambda name, jobs, status: search_tasks.add_result(task["id"], name, jobs, status)
+            gather_jobs(task["role"], task["company"], task["location"], on_result=publish, on_progress=publish)
+    except Exception as e:
+        print("Search task failed:", e)
+    finally:
+        stop.set()
+        search_tasks.finish(task["id"])
+
+    try:
+        with app.app_context():
+            match_new_jobs()
+    except Exception as e:
+        print("Alert matching failed:", e)
+
+
+# ----------------- WORKER LOOP -----------------
+def work(index):
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    with app.app_context():
+        db.engine.dispose()  # never share SQLite connections opened before the fork
+
+    if DRIVER_POOL_WARM:
+        get_pool = registry.resolve("executors.driver_pool:get_pool")
+        threading.Thread(target=get_pool().warm, args=(DRIVER_POOL_WARM,), daemon=True).start()
+
+    print(f"Worker {index} ({name}) ready")
+    while not stopping.is_set():
+        search_tasks.requeue_stale()
+        task = search_tasks.claim(name)
+        if task is None:
+            stopping.wait(POLL_INTERVAL)
+            continue
+        run_task(task)
+        search_tasks.prune()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run JobFinder scraping workers")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="worker processes to start")
+    args = parser.parse_args()
+
+    init_db()  # once, before any worker process starts
+    if args.workers <= 1:
+        work(0)
+        return
+
+    procs = [multiprocessing.Process(target=work, args=(i,), name=f"worker-{i}") for i in range(args.workers)]
+    for proc in procs:
+        proc.start()
+
+    def shutdown(*_):
+        for proc in procs:
+            proc.terminate()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for proc in procs:
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()